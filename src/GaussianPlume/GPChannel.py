@@ -1,12 +1,8 @@
-import importlib 
-
 import numpy
 import ClassTools as CT
 import GPFunctions as GPF
 import GPMolecule as GPMO
 
-importlib.reload(GPF)
-importlib.reload(GPMO)
 
 class Channel(CT.ClassTools):
     """
@@ -48,7 +44,9 @@ class Channel(CT.ClassTools):
         """
         self.verbose = verbose
         
-        verbose = GPF.print_vars(function_name = "GPChannel.Channel.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)      
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPChannel.Channel.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         self.channel_id = channel_id
         self.device_name = device_name
@@ -96,7 +94,9 @@ class Channel(CT.ClassTools):
         
         
         """
-        verbose = GPF.print_vars(function_name = "GPChannel.Channel.get_concentration_for_plume()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)   
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPChannel.Channel.get_concentration_for_plume()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         self.plume_number = kwargs.get("plume_number", self.plume_number)
         
@@ -51,20 +51,69 @@ def dispersion_constants(dispersion_mode):
     return dispersion_constants
 
 
+# properties of the implemented molecules, the order matches implemented_molecules()
+_molecules = [
+    {
+        "id": "co2",
+        "aliases": ["co2", "carbon dioxide"],
+        "formula": "CO2",
+        "name": "carbon dioxide",
+        "molecular_mass": 44.009,
+    },
+    {
+        "id": "ch4",
+        "aliases": ["methane", "ch4"],
+        "formula": "CH4",
+        "name": "methane",
+        "molecular_mass": 16,
+    },
+    {
+        "id": "no",
+        "aliases": ["no", "nitrogen oxide"],
+        "formula": "NO",
+        "name": "nitrogen oxide",
+        "molecular_mass": 30,
+    },
+    {
+        "id": "nox",
+        "aliases": ["nox"],
+        "formula": "NOx",
+        "name": "nitrogen oxides",
+        "molecular_mass": 30,
+    },
+    {
+        "id": "n2o",
+        "aliases": ["n2o", "nitrous oxide"],
+        "formula": "N2O",
+        "name": "nitrous oxide",
+        "molecular_mass": 44,
+    },
+    {
+        "id": "no2",
+        "aliases": ["no2", "nitrogen dioxide"],
+        "formula": "NO2",
+        "name": "nitrogen dioxide",
+        "molecular_mass": 46,
+    },
+    {
+        "id": "c2h6",
+        "aliases": ["c2h6", "ethane"],
+        "formula": "C2H6",
+        "name": "ethane",
+        "molecular_mass": 30,
+    },
+]
+
+# lookup table from every alias to the properties of the molecule
+molecule_table = {alias: props for props in _molecules for alias in props["aliases"]}
+
+
 def implemented_molecules():
     """
     List with molecule that are implemented. The order of the list has to match with the order of molecule_properties().
     
     """
-    return [
-            ["co2", "carbon dioxide"],
-            ["methane", "ch4"],
-            ["no", "nitrogen oxide"],
-            ["nox"],
-            ["n2o", "nitrous oxide"],
-            ["no2", "nitrogen dioxide"],
-            ["c2h6", "ethane"],
-        ]
+    return [list(props["aliases"]) for props in _molecules]
         
 def molecule_properties(molecule, invalid = "warning"):
     """
@@ -93,65 +142,11 @@ def molecule_properties(molecule, invalid = "warning"):
     
     molecule = molecule.lower()
 
-    molecules = implemented_molecules()
-
-    if molecule in molecules[0]:
-        return {
-            "id": "co2",
-            "aliases": ["co2", "carbon dioxide"],
-            "formula": "CO2",
-            "name": "carbon dioxide",
-            "molecular_mass": 44.009,
-        }
-    elif molecule in molecules[1] :
-        return {
-            "id": "ch4",
-            "aliases": ["methane", "ch4"],
-            "formula": "CH4",
-            "name": "methane",
-            "molecular_mass": 16,
-        }
-    elif molecule in molecules[2]:
-        return {
-            "id": "no",
-            "aliases": ["no", "nitrogen oxide"],
-            "formula": "NO",
-            "name": "nitrogen oxide",
-            "molecular_mass": 30,
-        }  
-    elif molecule in molecules[3]:
-        return {
-            "id": "nox",
-            "aliases": ["nox"],
-            "formula": "NOx",
-            "name": "nitrogen oxides",
-            "molecular_mass": 30,
-        }   
-
-    elif molecule in molecules[4]:
-        return {
-            "id": "n2o",
-            "aliases": ["n2o", "nitrous oxide"],
-            "formula": "N2O",
-            "name": "nitrous oxide",
-            "molecular_mass": 44,
-        }        
-    elif molecule in molecules[5]:
-        return {
-            "id": "no2",
-            "aliases": ["no2", "nitrogen dioxide"],
-            "formula": "NO2",
-            "name": "nitrogen dioxide",
-            "molecular_mass": 46,
-        }        
-    elif molecule in molecules[6] :
-        return {
-            "id": "c2h6",
-            "aliases": ["c2h6", "ethane"],
-            "formula": "C2H6",
-            "name": "ethane",
-            "molecular_mass": 30,
-        }       
+    props = molecule_table.get(molecule)
+    
+    if props is not None:
+        # a copy, so that the table can not be changed by the caller
+        return dict(props, aliases = list(props["aliases"]))
     else:
         if invalid == "error":
             raise ValueError ("GPConstants.molecule_properties(): {:} is not a valid name for a molecule".format(molecule))
@@ -1,4 +1,5 @@
-import importlib
+import functools
+import math
 import pathlib
 
 import warnings
@@ -9,9 +10,26 @@ import numpy
 
 import GPConstants as GPC
 
-importlib.reload(GPC)
 
-def latlon2dlatdlon(lat, lon, latR, lonR, warn_distance_above_meter = 100000, verbose = 0, **kwargs):
+def _check_distance(warn_distance_above_meter):
+    """
+    Check if the distance warning is switched on. 
+    
+    Arguments
+    ---------
+    warn_distance_above_meter : number, None
+        The distance above which a warning is given. 
+        
+    Returns
+    -------
+    bool
+        False if `warn_distance_above_meter` is None or infinite.
+    
+    """
+    return warn_distance_above_meter is not None and math.isfinite(warn_distance_above_meter)
+
+
+def latlon2dlatdlon(lat, lon, latR, lonR, warn_distance_above_meter = 100000, dtype = None, verbose = 0, **kwargs):
     """
     Calculate the distance in meter in north-south and east-west direction for two coordinates. 
     
@@ -31,8 +49,10 @@ def latlon2dlatdlon(lat, lon, latR, lonR, warn_distance_above_meter = 100000, ve
         Latitude of the reference
     lonR : number, ndarray
         Longitude of the reference
-    warn_distance_above_meter : number (100000)
-        Give a warning when a distance is above this distance (in meters)
+    warn_distance_above_meter : number, None (100000)
+        Give a warning when a distance is above this distance (in meters). With None or numpy.inf the check is skipped, which saves some time on long series. 
+    dtype : numpy dtype (None)
+        If given, for example numpy.float32, the calculation is done in this precision. By default float64 is used.
         
     Returns
     -------
@@ -43,28 +63,46 @@ def latlon2dlatdlon(lat, lon, latR, lonR, warn_distance_above_meter = 100000, ve
     
     
     """
-    verbose = print_vars(function_name = "GPFunctions.latlon2dlatdlon()", function_vars = vars(), verbose = verbose, self_verbose = 0)   
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.latlon2dlatdlon()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
     latlon2dxdy_lon_conversion_factor = kwargs.get("latlon2dxdy_lon_conversion_factor", GPC.latlon2dxdy_lon_conversion_factor)
     latlon2dxdy_lat_conversion_factor = kwargs.get("latlon2dxdy_lat_conversion_factor", GPC.latlon2dxdy_lat_conversion_factor)
     
-    
-    if type(lat) == list:
-        lat = numpy.array(lat)
-    if type(lon) == list:
-        lon = numpy.array(lon)
-    if type(latR) == list:
-        latR = numpy.array(latR)
-    if type(lonR) == list:
-        lonR = numpy.array(lonR)        
-    
-    dlat = numpy.sin((lat - latR) * GPC.deg2rad) * latlon2dxdy_lat_conversion_factor
-    dlon = numpy.cos(lat * GPC.deg2rad) * numpy.sin((lon - lonR) * GPC.deg2rad) * latlon2dxdy_lon_conversion_factor 
-
-    dist = numpy.sqrt(dlat**2 + dlon**2)
-    idx = numpy.where(dist > warn_distance_above_meter)[0]
-    if len(idx) > 0:
-        warnings.warn("GPFunctions.latlon2dlatdlon(): distance is above {:} meter for {:d} data points".format(warn_distance_above_meter, len(idx)))
+    # single coordinates: math.sin and math.cos are much faster than the numpy ufuncs on scalars
+    if dtype is None and numpy.isscalar(lat) and numpy.isscalar(lon) and numpy.isscalar(latR) and numpy.isscalar(lonR):
+        dlat = math.sin((lat - latR) * GPC.deg2rad) * latlon2dxdy_lat_conversion_factor
+        dlon = math.cos(lat * GPC.deg2rad) * math.sin((lon - lonR) * GPC.deg2rad) * latlon2dxdy_lon_conversion_factor
+        if _check_distance(warn_distance_above_meter) and dlat * dlat + dlon * dlon > warn_distance_above_meter * warn_distance_above_meter:
+            warnings.warn("GPFunctions.latlon2dlatdlon(): distance is above {:} meter for {:d} data points".format(warn_distance_above_meter, 1))
+        return dlat, dlon
+    
+    lat = numpy.asarray(lat, dtype = dtype)
+    lon = numpy.asarray(lon, dtype = dtype)
+    latR = numpy.asarray(latR, dtype = dtype)
+    lonR = numpy.asarray(lonR, dtype = dtype)
+    
+    # convert to radians once and evaluate the three trig terms into preallocated buffers
+    lat_rad = lat * GPC.deg2rad
+    dlat_rad = (lat - latR) * GPC.deg2rad
+    dlon_rad = (lon - lonR) * GPC.deg2rad
+
+    sin_dlat = numpy.empty_like(dlat_rad)
+    cos_lat = numpy.empty_like(lat_rad)
+    sin_dlon = numpy.empty_like(dlon_rad)
+    numpy.sin(dlat_rad, out = sin_dlat)
+    numpy.cos(lat_rad, out = cos_lat)
+    numpy.sin(dlon_rad, out = sin_dlon)
+
+    dlat = sin_dlat * latlon2dxdy_lat_conversion_factor
+    dlon = cos_lat * sin_dlon * latlon2dxdy_lon_conversion_factor
+
+    # compare squared distances, no sqrt needed
+    if _check_distance(warn_distance_above_meter):
+        thr2 = warn_distance_above_meter * warn_distance_above_meter
+        idx = numpy.flatnonzero(dlat * dlat + dlon * dlon > thr2)
+        if len(idx) > 0:
+            warnings.warn("GPFunctions.latlon2dlatdlon(): distance is above {:} meter for {:d} data points".format(warn_distance_above_meter, len(idx)))
     
     return dlat, dlon 
 
@@ -72,7 +110,26 @@ def latlon2dlatdlon(lat, lon, latR, lonR, warn_distance_above_meter = 100000, ve
 
 
 
-def dlatdlon2dxdy(dlatS, dlonS, dlatM, dlonM, wind_direction, warn_distance_above_meter = 100000, verbose = 0):
+def wind_direction_sin_cos(wind_direction):
+    """
+    Sine and cosine of the wind direction.
+    
+    Arguments
+    ---------
+    wind_direction : number, ndarray, list
+        Direction from which the wind comes, in degrees
+    
+    Returns
+    -------
+    sin_wd, cos_wd : ndarray
+        Can be given to `dlatdlon2dxdy` as `sin_cos_wind_direction`, to compute them once for several sources with the same wind direction. 
+    
+    """
+    wd_rad = numpy.asarray(wind_direction) * GPC.deg2rad
+    return numpy.sin(wd_rad), numpy.cos(wd_rad)
+
+
+def dlatdlon2dxdy(dlatS, dlonS, dlatM, dlonM, wind_direction, warn_distance_above_meter = 100000, sin_cos_wind_direction = None, verbose = 0):
     """
     Calculate dx and dy.     
     
@@ -88,32 +145,101 @@ def dlatdlon2dxdy(dlatS, dlonS, dlatM, dlonM, wind_direction, warn_distance_abov
         East-west distance between measurement and reference, where positive means the measurement is east of the reference
     wind_direction : number, ndarray, list
         Direction from which the wind comes, in degrees
-    warn_distance_above_meter : number (100000)
-        Give a warning when a distance is above this distance (in meters)
+    warn_distance_above_meter : number, None (100000)
+        Give a warning when a distance is above this distance (in meters). With None or numpy.inf the check is skipped, which saves some time on long series. 
+    sin_cos_wind_direction : tuple, None (None)
+        Sine and cosine of the wind direction, from `wind_direction_sin_cos`. If given, `wind_direction` is not used. 
     
     """
 
-    verbose = print_vars(function_name = "GPFunctions.dlatdlon2dxdy()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.dlatdlon2dxdy()", function_vars = vars(), verbose = verbose, self_verbose = 0)
+    
+    dlatS = numpy.asarray(dlatS)
+    dlonS = numpy.asarray(dlonS)
+    dlatM = numpy.asarray(dlatM)
+    dlonM = numpy.asarray(dlonM)
+
+    if sin_cos_wind_direction is None:
+        sin_cos_wind_direction = wind_direction_sin_cos(wind_direction)
+    swd, cwd = sin_cos_wind_direction
+    ddlat = dlatS - dlatM
+    ddlon = dlonS - dlonM
+    if numpy.ndim(swd) == 0 and max(numpy.ndim(ddlat), numpy.ndim(ddlon)) > 0:
+        # one wind direction for all points: a single rotation matrix applied to the stacked distances
+        rotation = numpy.array([[cwd, swd], [swd, -cwd]])
+        ddlat, ddlon = numpy.broadcast_arrays(ddlat, ddlon)
+        dx, dy = (rotation @ numpy.stack([ddlat.ravel(), ddlon.ravel()])).reshape((2, *ddlat.shape))
+    else:
+        # a rotation per point, the matrix product is written out
+        dx = ddlat * cwd + ddlon * swd
+        dy = ddlat * swd - ddlon * cwd
     
-    if type(dlatS) == list:
-        dlatS = numpy.array(dlatS)
-    if type(dlonS) == list:
-        dlonS = numpy.array(dlonS)
-    if type(dlatM) == list:
-        dlatM = numpy.array(dlatM)
-    if type(dlonM) == list:
-        dlonM = numpy.array(dlonM)        
-    if type(wind_direction) == list:
-        wind_direction = numpy.array(wind_direction)
+    # compare squared distances, no sqrt needed
+    if _check_distance(warn_distance_above_meter):
+        thr2 = warn_distance_above_meter * warn_distance_above_meter
+        idx = numpy.flatnonzero(dx * dx + dy * dy > thr2)
+        if len(idx) > 0:
+            warnings.warn("GPFunctions.dlatdlon2dxdy(): distance is above {:} meter for {:d} data points".format(warn_distance_above_meter, len(idx)))
+
+    return dx, dy
+
+
+def latlon2dxdy(latS, lonS, latM, lonM, latR, lonR, wind_direction, warn_distance_above_meter = 100000, sin_cos_wind_direction = None, verbose = 0, **kwargs):
+    """
+    Calculate dx and dy directly from the coordinates of the source, the measurement and the reference.
+
+    The result is the same as `latlon2dlatdlon` for the source and the measurement, followed by `dlatdlon2dxdy`, but it is done in one pass and the intermediate dlatS, dlonS, dlatM and dlonM are not returned.
+
+    Arguments
+    ---------
+    latS, lonS : number, ndarray, list
+        Latitude and longitude of the source
+    latM, lonM : number, ndarray, list
+        Latitude and longitude of the measurement
+    latR, lonR : number, ndarray, list
+        Latitude and longitude of the reference
+    wind_direction : number, ndarray, list
+        Direction from which the wind comes, in degrees
+    warn_distance_above_meter : number, None (100000)
+        Give a warning when a distance is above this distance (in meters). With None or numpy.inf the check is skipped, which saves some time on long series. 
+    sin_cos_wind_direction : tuple, None (None)
+        Sine and cosine of the wind direction, from `wind_direction_sin_cos`. If given, `wind_direction` is not used. 
+
+    Returns
+    -------
+    dx, dy : number or ndarray
+        Distance between source and measurement along and perpendicular to the wind direction.
+
+    """
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.latlon2dxdy()", function_vars = vars(), verbose = verbose, self_verbose = 0)
+
+    latlon2dxdy_lon_conversion_factor = kwargs.get("latlon2dxdy_lon_conversion_factor", GPC.latlon2dxdy_lon_conversion_factor)
+    latlon2dxdy_lat_conversion_factor = kwargs.get("latlon2dxdy_lat_conversion_factor", GPC.latlon2dxdy_lat_conversion_factor)
+
+    latS = numpy.asarray(latS)
+    lonS = numpy.asarray(lonS)
+    latM = numpy.asarray(latM)
+    lonM = numpy.asarray(lonM)
+    latR = numpy.asarray(latR)
+    lonR = numpy.asarray(lonR)
+
+    # dlatS - dlatM and dlonS - dlonM, without storing the four intermediates
+    ddlat = (numpy.sin((latS - latR) * GPC.deg2rad) - numpy.sin((latM - latR) * GPC.deg2rad)) * latlon2dxdy_lat_conversion_factor
+    ddlon = (numpy.cos(latS * GPC.deg2rad) * numpy.sin((lonS - lonR) * GPC.deg2rad) - numpy.cos(latM * GPC.deg2rad) * numpy.sin((lonM - lonR) * GPC.deg2rad)) * latlon2dxdy_lon_conversion_factor
+
+    if sin_cos_wind_direction is None:
+        sin_cos_wind_direction = wind_direction_sin_cos(wind_direction)
+    swd, cwd = sin_cos_wind_direction
+    dx = ddlat * cwd + ddlon * swd
+    dy = ddlat * swd - ddlon * cwd
+
+    if _check_distance(warn_distance_above_meter):
+        n_far = numpy.count_nonzero(dx * dx + dy * dy > warn_distance_above_meter * warn_distance_above_meter)
+        if n_far > 0:
+            warnings.warn("GPFunctions.latlon2dxdy(): distance is above {:} meter for {:d} data points".format(warn_distance_above_meter, n_far))
 
-    dx = (dlatS - dlatM) * numpy.cos(wind_direction * GPC.deg2rad) + (dlonS - dlonM) * numpy.sin(wind_direction * GPC.deg2rad)
-    dy = (dlatS - dlatM) * numpy.sin(wind_direction * GPC.deg2rad) - (dlonS - dlonM) * numpy.cos(wind_direction * GPC.deg2rad)
-    
-    dist = numpy.sqrt(dx**2 + dy**2)
-    idx = numpy.where(dist > warn_distance_above_meter)[0]
-    if len(idx) > 0:
-        warnings.warn("GPFunctions.dlatdlon2dxdy(): distance is above {:} meter for {:d} data points".format(warn_distance_above_meter, len(idx)))
-    
     return dx, dy
 
 
@@ -132,9 +258,20 @@ def get_dispersion_constants(dispersion_mode, verbose = 0):
         A table with constants. Rows are the stability classes, columns the factors. 
     
     """
-    verbose = print_vars(function_name = "GPFunctions.get_dispersion_constants()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.get_dispersion_constants()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
-    return GPC.dispersion_constants(dispersion_mode)
+    return _cached_dispersion_constants(dispersion_mode)
+
+
+@functools.lru_cache(maxsize = None)
+def _cached_dispersion_constants(dispersion_mode):
+    """
+    Cached version of GPConstants.dispersion_constants(). The table is shared between callers, so it is made read-only.
+    """
+    dispersion_constants = GPC.dispersion_constants(dispersion_mode)
+    dispersion_constants.flags.writeable = False
+    return dispersion_constants
 
 
 def get_molecule_properties(molecule, verbose = 0):
@@ -153,8 +290,10 @@ def get_molecule_properties(molecule, verbose = 0):
         Dictionary with molecule properties
     
     """
-    verbose = print_vars(function_name = "GPFunctions.get_molecule_properties()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.get_molecule_properties()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
+    # GPConstants.molecule_properties() is a lookup in GPConstants.molecule_table
     return GPC.molecule_properties(molecule)
 
 
@@ -176,12 +315,13 @@ def calculate_tc(dx, wind_speed, verbose = 0):
         Travel time in seconds. 
     
     """
-    verbose = print_vars(function_name = "GPFunctions.calculate_tc()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.calculate_tc()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
     return dx / (3600 * wind_speed)
 
 
-def calculate_sigma(dx, z0, tc, dispersion_constants, stability_index, tc_minimum = 0, offset_sigma_z = 0, verbose = 0, **kwargs):
+def calculate_sigma(dx, z0, tc, dispersion_constants, stability_index, tc_minimum = 0, offset_sigma_z = 0, dtype = None, verbose = 0, **kwargs):
     """
     Calculate the plume width and height at dx. 
     
@@ -203,6 +343,8 @@ def calculate_sigma(dx, z0, tc, dispersion_constants, stability_index, tc_minimu
         Table with dispersion constants
     stability_index : number
         Index 0-5 for stability, where 0 is most stable.
+    dtype : numpy dtype (None)
+        If given, for example numpy.float32, the calculation is done in this precision. By default float64 is used.
     
     Returns
     -------
@@ -210,27 +352,35 @@ def calculate_sigma(dx, z0, tc, dispersion_constants, stability_index, tc_minimu
         Values for the disk diameter in y and z direction.
     
     """
-    verbose = print_vars(function_name = "GPFunctions.calculate_sigma()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.calculate_sigma()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
     
     
-    if numpy.any(dx < 0):
-        idx_nan = numpy.where(dx < 0)[0]
-        dx[idx_nan] = numpy.nan
-        if type(tc) == numpy.ndarray:
-            tc[idx_nan] = numpy.nan        
+    if dtype is not None:
+        dx = numpy.asarray(dx, dtype = dtype)
+        z0 = numpy.asarray(z0, dtype = dtype)
+        dispersion_constants = numpy.asarray(dispersion_constants, dtype = dtype)
         
-    if type(tc) == numpy.ndarray:
-        idx = numpy.where(tc < tc_minimum)[0]
-        tc[idx] = tc_minimum
-    elif tc < tc_minimum:
-        tc = tc_minimum
+    # negative dx (measurement upwind of the source) gives nan, tc is at least tc_minimum
+    # new arrays are made, dx and tc of the caller are not changed
+    dx = numpy.where(dx < 0, numpy.nan, dx)
+    tc = numpy.maximum(numpy.asarray(tc, dtype = dtype), tc_minimum)
     
     ca = kwargs.get("ca", GPC.sigma_ca)
     cb = kwargs.get("cb", GPC.sigma_cb)
-    # print(dispersion_constants[stability_index[0],1])
-    sigma_y = dispersion_constants[stability_index,0] * dx**dispersion_constants[stability_index,1] * (z0**0.2) * (tc**0.35)
-    sigma_z = dispersion_constants[stability_index,2] * dx**dispersion_constants[stability_index,3] * (10*z0)**(ca * dx**cb) + offset_sigma_z
+    # gather from the transposed table, so that each constant is a contiguous array
+    # works for a single index as well as an array
+    c0, c1, c2, c3 = numpy.take(numpy.asarray(dispersion_constants).T, stability_index, axis = 1)
+    # the power laws share log(dx): dx**p == exp(p * log(dx))
+    # log(0) for dx == 0 or tc == 0 gives exp(-inf) == 0, the same as 0**p
+    with numpy.errstate(divide = "ignore"):
+        log_dx = numpy.log(dx)
+        dx_cb = numpy.exp(cb * log_dx)
+        # dx**c1 * tc**0.35 in a single exp
+        sigma_y = c0 * numpy.exp(c1 * log_dx + 0.35 * numpy.log(tc)) * (z0**0.2)
+    # (10*z0)**(ca * dx**cb) stays a power, dx == 0 gives 1**inf == 1 for z0 == 0.1 where exp(inf * log(1)) would be nan
+    sigma_z = c2 * numpy.exp(c3 * log_dx) * (10*z0)**(ca * dx_cb) + offset_sigma_z
  
     return sigma_y, sigma_z
 
@@ -238,10 +388,11 @@ def calculate_sigma(dx, z0, tc, dispersion_constants, stability_index, tc_minimu
 
 
 
-def calculate_concentration(qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm, molecular_mass, verbose = 0):
+def calculate_concentration(qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm, molecular_mass, grid = False, dtype = None, verbose = 0):
     """
     Calculate the concentration
     
+    All arguments are numbers or ndarrays that broadcast against each other. 
     
     Arguments
     ---------
@@ -263,18 +414,47 @@ def calculate_concentration(qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm, mo
         Height of the mixing layer in m. 
     molecular_mass : number
         Molecular mass in g/mol. 
+    grid : bool (False)
+        If True, `wind_speed`, `sigma_y` and `sigma_z` are taken per time and `dy` and `zr` per point. They are reshaped to (n,1) and (1,m) and the concentration is returned for every time and point, with shape (n,m), without tiling the inputs. `qs`, `hs`, `hm` and `molecular_mass` can be a number or an ndarray per time. 
+    dtype : numpy dtype (None)
+        If given, for example numpy.float32, the calculation is done in this precision. By default float64 is used. The exponents are small, so float32 is accurate enough for the model and is about twice as fast on long series. 
         
     """
-    verbose = print_vars(function_name = "GPFunctions.calculate_concentration()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
-        
-    A = qs / (2 * numpy.pi * wind_speed * sigma_y * sigma_z)
-    B = numpy.exp(-dy**2 / (2 * sigma_y**2))
-    C = 2 * sigma_z**2
-    D = numpy.exp(-(zr - hs)**2 / C)
-    E = numpy.exp(-(zr + hs)**2 / C)
-    F = numpy.exp(-(zr - (2 * hm - hs))**2 / C)    
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.calculate_concentration()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
-    conc = GPC.liter_per_mole_air * 1e6 * A * B * (D + E + F) / molecular_mass
+    if dtype is not None:
+        qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm, molecular_mass = [numpy.asarray(x, dtype = dtype) for x in (qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm, molecular_mass)]
+        
+    if grid:
+        qs = numpy.reshape(qs, (-1,1))
+        hs = numpy.reshape(hs, (-1,1))
+        hm = numpy.reshape(hm, (-1,1))
+        molecular_mass = numpy.reshape(molecular_mass, (-1,1))
+        wind_speed = numpy.reshape(wind_speed, (-1,1))
+        sigma_y = numpy.reshape(sigma_y, (-1,1))
+        sigma_z = numpy.reshape(sigma_z, (-1,1))
+        dy = numpy.reshape(dy, (1,-1))
+        zr = numpy.reshape(zr, (1,-1))
+        
+    # take the reciprocals of the plume sizes once, the rest are multiplications
+    inv_sy = 1 / sigma_y
+    inv_sz = 1 / sigma_z
+    
+    # 1 / (2 * sigma_z**2) is shared by the three vertical terms (source, ground reflection, mixing layer reflection)
+    inv_2sz2 = 0.5 * inv_sz * inv_sz
+    # the mixing layer term depends on all heights, so it has the full shape and the other two terms are added in place
+    vertical = numpy.exp(-(zr - (2 * hm - hs))**2 * inv_2sz2)
+    vertical += numpy.exp(-(zr - hs)**2 * inv_2sz2)
+    vertical += numpy.exp(-(zr + hs)**2 * inv_2sz2)
+    dy_sy = dy * inv_sy
+    horizontal = numpy.exp(-0.5 * dy_sy * dy_sy)
+    
+    # fold the constants into one factor before it touches the arrays
+    k = GPC.liter_per_mole_air * 1e6 / (2 * numpy.pi * molecular_mass)
+    if dtype is not None:
+        k = numpy.asarray(k, dtype = dtype)
+    conc = (k * qs) * horizontal * vertical * inv_sy * inv_sz / wind_speed
     
     # idx = numpy.where(numpy.absolute(dy) >= numpy.absolute(5*dx))[0]
     # conc[idx] = numpy.nan
@@ -293,6 +473,88 @@ def calculate_concentration(qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm, mo
             # + Exp(-(Zr - (2 * Hm - Hs)) ^ 2 / (2 * sigma_Z ^ 2))
         # )
 
+
+def calculate_concentration_batch(qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm, molecular_mass, block_size = 256, dtype = None, verbose = 0):
+    """
+    Calculate the concentration for every time and point, in blocks of time. 
+    
+    The arguments are the same as for `calculate_concentration` with `grid = True`. The time axis is split in blocks of `block_size` times, so that the temporary arrays are (block_size, m) instead of (n, m). The result is written into one preallocated array. 
+    
+    Arguments
+    ---------
+    qs, wind_speed, sigma_y, sigma_z, hs, hm, molecular_mass : number, ndarray
+        Values per time, with length n, or a number. 
+    dy, zr : number, ndarray
+        Values per point, with length m, or a number. 
+    block_size : int (256)
+        Number of times per block.
+    dtype : numpy dtype (None)
+        See `calculate_concentration`.
+        
+    Returns
+    -------
+    conc : ndarray
+        Concentration with shape (n,m).
+    
+    """
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.calculate_concentration_batch()", function_vars = vars(), verbose = verbose, self_verbose = 0)
+    
+    per_time = [numpy.reshape(x, (-1,1)) for x in (qs, wind_speed, sigma_y, sigma_z, hs, hm, molecular_mass)]
+    n = max(x.shape[0] for x in per_time)
+    m = numpy.size(dy) if numpy.size(dy) > 1 else numpy.size(zr)
+
+    conc = numpy.empty((n, m), dtype = dtype)
+    for i0 in range(0, n, block_size):
+        i1 = min(i0 + block_size, n)
+        # numbers (length 1) are used as they are, arrays are cut to the block
+        block = [x if x.shape[0] == 1 else x[i0:i1] for x in per_time]
+        _qs, _wind_speed, _sigma_y, _sigma_z, _hs, _hm, _molecular_mass = block
+        conc[i0:i1] = calculate_concentration(_qs, _wind_speed, _sigma_y, _sigma_z, dy, zr, _hs, _hm, _molecular_mass, grid = True, dtype = dtype)
+        
+    return conc
+
+
+def calculate_sigma_concentration(dx, z0, tc, dispersion_constants, stability_index, qs, wind_speed, dy, zr, hs, hm, molecular_mass, tc_minimum = 0, offset_sigma_z = 0, block_size = 32768, dtype = None, verbose = 0, **kwargs):
+    """
+    Calculate sigma y and z and the concentration in one pass, in blocks.
+    
+    The result is the same as `calculate_sigma` followed by `calculate_concentration`. The series are split in blocks of `block_size` values: sigma y and z of a block are used for the concentration of that block straight away, so they and the other temporary arrays stay small and are not kept for the whole series. 
+    
+    Arguments
+    ---------
+    dx, z0, tc, dispersion_constants, stability_index, tc_minimum, offset_sigma_z : 
+        See `calculate_sigma`.
+    qs, wind_speed, dy, zr, hs, hm, molecular_mass : 
+        See `calculate_concentration`.
+    block_size : int (32768)
+        Number of values per block. The temporary arrays of a block then fit in the cache, much smaller blocks spend more time in the Python loop.
+    dtype : numpy dtype (None)
+        See `calculate_concentration`.
+    
+    Returns
+    -------
+    conc : ndarray
+        Concentration, with one value for each value of the series. Numbers and 1D arrays with the same length can be mixed. 
+    
+    """
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.calculate_sigma_concentration()", function_vars = vars(), verbose = verbose, self_verbose = 0)
+    
+    series = [numpy.asarray(x) for x in (dx, z0, tc, stability_index, qs, wind_speed, dy, zr, hs, hm, molecular_mass, tc_minimum, offset_sigma_z)]
+    n = max(x.size for x in series)
+    
+    conc = numpy.empty(n, dtype = dtype)
+    for i0 in range(0, n, block_size):
+        i1 = min(i0 + block_size, n)
+        # numbers are used as they are, arrays are cut to the block
+        _dx, _z0, _tc, _stability_index, _qs, _wind_speed, _dy, _zr, _hs, _hm, _molecular_mass, _tc_minimum, _offset_sigma_z = [x if x.ndim == 0 else x[i0:i1] for x in series]
+        sigma_y, sigma_z = calculate_sigma(_dx, _z0, _tc, dispersion_constants, _stability_index, tc_minimum = _tc_minimum, offset_sigma_z = _offset_sigma_z, dtype = dtype, **kwargs)
+        conc[i0:i1] = calculate_concentration(_qs, _wind_speed, sigma_y, sigma_z, _dy, _zr, _hs, _hm, _molecular_mass, dtype = dtype)
+    
+    return conc
+    
+
 def print_vars(function_name, function_vars, verbose, self_verbose = 0):
     """
     Check the verbose level and print the arguments
@@ -302,7 +564,7 @@ def print_vars(function_name, function_vars, verbose, self_verbose = 0):
     function_name : str
         The name of the function. 
     function_vars : dict
-        Call the vars() function.
+        Call the vars() function. Callers in this module only call print_vars when verbose > 1, so vars() is not built in the common case.
     verbose : number
         Verbose level of the function.
     self_verbose : number (0)
@@ -316,9 +578,12 @@ def print_vars(function_name, function_vars, verbose, self_verbose = 0):
     """
     if self_verbose > verbose:
         verbose = self_verbose
-    
-    if verbose > 1:
-        print(function_name)           
+
+    # nothing is printed below verbose 2, skip the formatting
+    if verbose <= 1:
+        return verbose
+
+    print(function_name)
     if verbose > 2:
         for item in function_vars.items():
             if item[0] == "kwargs":
@@ -331,6 +596,11 @@ def print_vars(function_name, function_vars, verbose, self_verbose = 0):
     return verbose
 
 
+# lookup tables for the stability classes, index 0 is class A
+_stability_classes = numpy.array(["A", "B", "C", "D", "E", "F"])
+_stability_class_index = {c: i for i, c in enumerate(_stability_classes)}
+
+
 def stability_index2class(stability_index, verbose = 0):
     """
     Convert stability index (0-5) to a stability class (A-F).
@@ -346,18 +616,18 @@ def stability_index2class(stability_index, verbose = 0):
         A string or an array with strings with the stability class.
     
     """
-    verbose = print_vars(function_name = "GPFunctions.stability_index2class()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
-
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.stability_index2class()", function_vars = vars(), verbose = verbose, self_verbose = 0)
 
-    stability_classes = numpy.array(["A", "B", "C", "D", "E", "F"])
-    
     if type(stability_index) == int:
         if stability_index not in range(6):
             raise IndexError("stability_index is {:d}, which is out of range, it has to be 0, 1, 2, 3, 4, or 5.".format(stability_index))
     else:
-        if numpy.any(stability_index < 0) or numpy.any(stability_index > 5):
+        stability_index = numpy.asarray(stability_index)
+        # as unsigned integers, negative values become very large, so one comparison checks both ends
+        if numpy.any(stability_index.astype(numpy.uint64) > 5):
             raise IndexError("stability_index is out of range, it has to be 0, 1, 2, 3, 4, or 5.")
-    return stability_classes[stability_index]
+    return _stability_classes[stability_index]
 
 
 
@@ -377,35 +647,21 @@ def stability_class2index(stability_class, verbose = 0):
     
     """
 
-    verbose = print_vars(function_name = "GPFunctions.stability_class2index()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.stability_class2index()", function_vars = vars(), verbose = verbose, self_verbose = 0)
 
-    stability_classes = numpy.array(["A", "B", "C", "D", "E", "F"])
-    
     if type(stability_class) == str:
-        idx = numpy.where(stability_class.upper() == stability_classes)[0]
-        if len(idx) == 0:
+        if stability_class.upper() not in _stability_class_index:
             raise ValueError("stability_class {:s} does not exist".format(stability_class))
+        idx = numpy.array([_stability_class_index[stability_class.upper()]])
     else:
-        if type(stability_class) == list:   
-            stability_class = numpy.array(stability_class)
-        # idx = numpy.zeros(len(stability_class), dtype = int)
-        # for s_i, s in enumerate(stability_class):
-            # i = numpy.where(s.upper() == stability_classes)[0]
-            # if len(i) == 0:
-                # raise ValueError("stability_class {:s} does not exist".format(s))            
-            # else:
-                # idx[s_i] = i
-
-        idx = numpy.zeros(len(stability_class), dtype = int) - 1
-        
-        for sc_i, sc in enumerate(stability_classes):
-            i = numpy.where(stability_class == sc)[0]
-            if len(i) > 0:
-                idx[i] = sc_i
+        stability_class = numpy.asarray(stability_class, dtype = str)
 
-            i = numpy.where(stability_class == sc.lower())[0]
-            if len(i) > 0:
-                idx[i] = sc_i                
+        # stability_classes is sorted, so one searchsorted pass finds the index of every element
+        upper = numpy.char.upper(stability_class)
+        idx = numpy.searchsorted(_stability_classes, upper)
+        valid = _stability_classes[numpy.clip(idx, 0, 5)] == upper
+        idx[~valid] = -1
 
         if numpy.any(idx == -1):
             idx_invalid = numpy.where(idx == -1)[0]
@@ -476,7 +732,8 @@ def handle_filename_path(filename = None, path = None, verbose = 0):
     
     
     """
-    verbose = print_vars(function_name = "GPFunctions.handle_filename_path()", function_vars = vars(), verbose = verbose, self_verbose = 0)
+    if verbose > 1:
+        print_vars(function_name = "GPFunctions.handle_filename_path()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
     if filename is None and path is None:
         return None
@@ -1,19 +1,84 @@
-import importlib
+import hashlib
+import pathlib
+
 import numpy
 import pandas
 
 import GPFunctions as GPF
 
-importlib.reload(GPF)
 
-def import_df_from_Excel(paf, sheetname, **kwargs):
+# python-calamine reads Excel files much faster than openpyxl, use it when it is installed
+try:
+    import python_calamine
+    excel_engine = "calamine"
+except ImportError:
+    excel_engine = None
+
+
+def open_Excel(paf):
+    """
+    Open an Excel file, to read several sheets from it. 
+    
+    The calamine engine is used when python-calamine is installed, otherwise the pandas default (openpyxl). 
     
+    Arguments
+    ---------
+    paf : Path or str
+        The path and filename.
+        
+    Returns
+    -------
+    pandas.ExcelFile
+    
+    """
+    return pandas.ExcelFile(paf, engine = excel_engine)
+
+
+def import_df_from_Excel(paf, sheetname, **kwargs):
+    """
+    Import a sheet from an Excel file.
+
+    Arguments
+    ---------
+    paf : Path, str or pandas.ExcelFile
+        The path and filename. If an opened pandas.ExcelFile is given, the sheet is read from it, so that several sheets can be read while the workbook is parsed only once.
+    sheetname : str
+        The name of the sheet.
+
+    """
+    if isinstance(paf, pandas.ExcelFile):
+        return pandas.read_excel(paf, sheetname, **kwargs)
+
+    kwargs.setdefault("engine", excel_engine)
     with open(paf, "rb") as F:
         df = pandas.read_excel(F, sheetname, **kwargs)
         
     return df
     
-def import_df_from_csv(paf, **kwargs):
+def import_df_from_csv(paf, use_arrow = False, cache = False, **kwargs):
+    """
+    Import a csv file.
+    
+    Arguments
+    ---------
+    paf : Path or str
+        The path and filename.
+    use_arrow : bool (False)
+        Parse the file with the pyarrow engine of pandas, which is multithreaded and much faster for large files. pyarrow has to be installed. The columns are the same as with the default engine.
+    cache : bool (False)
+        Keep a parquet copy of the parsed data next to the csv file, named `<name>.<key>.gpcache.parquet`, with `key` a hash of the arguments for `read_csv`. If that file is newer than the csv file, it is read instead of the csv file. pyarrow has to be installed. 
+        
+    """
+    if use_arrow:
+        kwargs.setdefault("engine", "pyarrow")
+    
+    if cache:
+        # other read arguments give other data, so they get their own cache file
+        key = hashlib.sha1(repr(sorted(kwargs.items())).encode()).hexdigest()[:12]
+        paf = pathlib.Path(paf)
+        paf_cache = paf.with_name("{:s}.{:s}.gpcache.parquet".format(paf.stem, key))
+        if paf_cache.exists() and paf_cache.stat().st_mtime >= paf.stat().st_mtime:
+            return pandas.read_parquet(paf_cache)
     
     with open(paf, "rb") as F:
         df = pandas.read_csv(F, **kwargs)
@@ -21,6 +86,9 @@ def import_df_from_csv(paf, **kwargs):
     if "datetime" in df.columns:
         df["datetime"] = pandas.to_datetime(df["datetime"], format = "%d/%m/%Y %H:%M:%S")
     
+    if cache:
+        df.to_parquet(paf_cache, compression = "zstd")
+    
     return df
 
 
@@ -29,7 +97,8 @@ def merge_dynamic_data(df, df_dynamic, verbose = 0):
     
     
     """
-    verbose = GPF.print_vars(function_name = "GPImport.merge_dynamic_data()", function_vars = vars(), verbose = verbose, self_verbose = 0)  
+    if verbose > 1:
+        GPF.print_vars(function_name = "GPImport.merge_dynamic_data()", function_vars = vars(), verbose = verbose, self_verbose = 0)
     
     if df is None:
         raise ValueError("GPImport.merge_dynamic_data(): df can not be None.")
@@ -45,16 +114,13 @@ def merge_dynamic_data(df, df_dynamic, verbose = 0):
         df_d_times = pandas.to_datetime(df_dynamic.loc[:,"datetime"])
         df_d_colnames = df_dynamic.columns
 
-        temp = numpy.zeros((df_rows, df_d_cols-1))
-        temp[:,:] = numpy.nan
-
-        temp_df = pandas.DataFrame(temp, columns = df_d_colnames[1:])
-
-        for t_i, t in enumerate(df_d_times):
-            idx = numpy.where(df_times > t)[0][0]
-            temp_df.loc[idx, df_d_colnames[1:]] = df_dynamic.loc[t_i, df_d_colnames[1:]]
+        # the first row in df after each time in df_dynamic, if several times share a row, the last one is used
+        rows = numpy.array([numpy.flatnonzero(df_times > t)[0] for t in df_d_times])
+        temp_df = df_dynamic.loc[:, df_d_colnames[1:]].set_axis(rows, axis = 0)
+        temp_df = temp_df[~temp_df.index.duplicated(keep = "last")]
 
-        temp_df.fillna(method = "ffill", inplace = True) 
+        # keeps the dtype of each column, strings are not cast to float first
+        temp_df = temp_df.reindex(pandas.RangeIndex(df_rows)).ffill()
         temp_df = temp_df.astype("category")
         df = pandas.concat([df, temp_df], axis = 1)
         
@@ -1,14 +1,7 @@
-import importlib 
-
-import numpy
-
 import ClassTools as CT
 import GPFunctions as GPF
 import GPConstants as GPC
 
-importlib.reload(CT)
-importlib.reload(GPF)
-importlib.reload(GPC)
 
 class Molecule(CT.ClassTools):
 
@@ -24,7 +17,9 @@ class Molecule(CT.ClassTools):
         """
         self.verbose = verbose
         
-        verbose = GPF.print_vars(function_name = "GPMolecule.Molecule.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)   
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPMolecule.Molecule.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         self.molecule = molecule
         
@@ -1,15 +1,7 @@
-import importlib
-
-import numpy
-
-import pandas
-
 import ClassTools as CT
 import GPFunctions as GPF
 import GPMolecule as GPMO
 
-importlib.reload(GPF)
-importlib.reload(GPMO)
 
 class Plume(CT.ClassTools):
     """
@@ -35,7 +27,9 @@ class Plume(CT.ClassTools):
         """
         self.verbose = verbose
         
-        verbose = GPF.print_vars(function_name = "GPPlume.Plume.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPPlume.Plume.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         self.plume_id = plume_id
         
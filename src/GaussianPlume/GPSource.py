@@ -1,18 +1,23 @@
-import importlib
-
 import numpy
 
-import pandas
-
 import ClassTools as CT
 import GPFunctions as GPF
 import GPMolecule as GPMO
 
-importlib.reload(GPF)
-importlib.reload(GPMO)
 
 class Source(CT.ClassTools):
 
+    # optional keyword arguments of __init__, stored as attributes with the same name
+    parameters = (
+        "dx", "dy", 
+        "dlatS", "dlonS", "dlatM", "dlonM", 
+        "latS", "lonS", "latR", "lonR", "latM", "lonM", 
+        "warn_distance_above_meter", 
+        "wind_direction", "wind_speed", "qs", "hs", "hm", "z0", "zr", "offset_sigma_z", "dispersion_mode", "dispersion_constants", 
+        "tc", "tc_minimum", 
+        "sigma_y", "sigma_z",
+    )
+
     def __init__(self, source_id, molecule = None, verbose = 0, **kwargs):
         """
         
@@ -24,11 +29,15 @@ class Source(CT.ClassTools):
             The name of the molecule emitted by the source.
         label : str, optional
             The name of the source. If no label is given, it is given as sourceX, where X is the `source_identifier`. 
+        **kwargs 
+            The parameters in `Source.parameters`. Parameters that are not given are None. 
         
         """
         self.verbose = verbose
         
-        verbose = GPF.print_vars(function_name = "GPSource.Source.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPSource.Source.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         self.source_id = source_id
 
@@ -46,39 +55,10 @@ class Source(CT.ClassTools):
             else:
                 self.label = "{:} {:s}".format(self.source_id, self.molecule.name)
     
-        self.dx = kwargs.get("dx", None)
-        self.dy = kwargs.get("dy", None)
-        
-        self.dlatS = kwargs.get("dlatS", None)
-        self.dlonS = kwargs.get("dlonS", None)
-        self.dlatM = kwargs.get("dlatM", None)
-        self.dlonM = kwargs.get("dlonM", None)  
-        
-        self.latS = kwargs.get("latS", None)
-        self.lonS = kwargs.get("lonS", None)        
-        self.latR = kwargs.get("latR", None)
-        self.lonR = kwargs.get("lonR", None)     
-        self.latM = kwargs.get("latM", None)
-        self.lonM = kwargs.get("lonM", None)  
-        
-        self.warn_distance_above_meter = kwargs.get("warn_distance_above_meter", None)
-        
-        self.wind_direction = kwargs.get("wind_direction", None)
-        self.wind_speed = kwargs.get("wind_speed", None)
-        self.qs = kwargs.get("qs", None)
-        self.hs = kwargs.get("hs", None)
-        self.hm = kwargs.get("hm", None)
-        self.z0 = kwargs.get("z0", None)
-        self.zr = kwargs.get("zr", None)
-        self.offset_sigma_z = kwargs.get("offset_sigma_z", None)
-        self.dispersion_mode = kwargs.get("dispersion_mode", None)
-        self.dispersion_constants = kwargs.get("dispersion_constants", None)
-
-        self.tc = kwargs.get("tc", None)
-        self.tc_minimum = kwargs.get("tc_minimum", None)
-
-        self.sigma_y = kwargs.get("sigma_y", None)
-        self.sigma_z = kwargs.get("sigma_z", None)        
+        # all parameters in one update of the attributes, the ones that are not given are None
+        values = dict.fromkeys(self.parameters)
+        values.update((key, kwargs[key]) for key in self.parameters if key in kwargs)
+        self.__dict__.update(values)
         
         self._stability_index = None
         self._stability_class = None
@@ -115,6 +95,15 @@ class Source(CT.ClassTools):
 
 
 
+    def missing_parameters(self, names):
+        """
+        The names in `names` of the parameters that are None. 
+        
+        Only used to make the error message once a check has failed, the checks themselves are plain `is None` tests. 
+        
+        """
+        return [name for name in names if getattr(self, name) is None]
+
     def calculate_dxdy(self, verbose = 0):
         """
         
@@ -123,7 +112,9 @@ class Source(CT.ClassTools):
 
         
         """
-        verbose = GPF.print_vars(function_name = "GPSource.Source.calculate_dxdy()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPSource.Source.calculate_dxdy()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         if verbose > 2:
             print("latS: {:}".format(self.latS))
@@ -136,45 +127,30 @@ class Source(CT.ClassTools):
         if self.dx is not None and self.dy is not None:
             pass
         else:
-        
+
+            # source and measurement both need a conversion: stack them and do it in one call
+            # only if both are series, a fixed measurement location would be repeated and the trigonometry done for every copy
+            need_S = self.dlatS is None or self.dlonS is None
+            need_M = self.dlatM is None or self.dlonM is None
+            have_latlon = all(x is not None for x in [self.latS, self.lonS, self.latM, self.lonM, self.latR, self.lonR])
+            same_series = have_latlon and numpy.ndim(self.latS) > 0 and numpy.shape(self.latS) == numpy.shape(self.latM) == numpy.shape(self.lonS) == numpy.shape(self.lonM)
+            if need_S and need_M and same_series:
+                latS, lonS, latM, lonM, latR, lonR = numpy.broadcast_arrays(self.latS, self.lonS, self.latM, self.lonM, self.latR, self.lonR)
+                dlat, dlon = GPF.latlon2dlatdlon(lat = numpy.stack([latS, latM]), lon = numpy.stack([lonS, lonM]), latR = numpy.stack([latR, latR]), lonR = numpy.stack([lonR, lonR]), verbose = verbose)
+                self.dlatS, self.dlatM = dlat
+                self.dlonS, self.dlonM = dlon
+
             if self.dlatS is None or self.dlonS is None:
                 if self.latS is not None and self.lonS is not None and self.latR is not None and self.lonR is not None:
                     self.dlatS, self.dlonS = GPF.latlon2dlatdlon(lat = self.latS, lon = self.lonS, latR = self.latR, lonR = self.lonR, verbose = verbose) 
                 else:
-                    
-                    error_string = "GPSource.calculate_dxdy(): no location data for: "
-                    if self.dlatS is None:
-                        error_string = "{:s} dlatS, ".format(error_string)
-                    if self.dlonS is None:
-                        error_string = "{:s} dlonS, ".format(error_string)
-                    if self.latS is None:
-                        error_string = "{:s} latS, ".format(error_string)
-                    if self.lonS is None:
-                        error_string = "{:s} lonS, ".format(error_string)
-                    if self.latR is None:
-                        error_string = "{:s} latR, ".format(error_string)
-                    if self.lonR is None:
-                        error_string = "{:s} lonR, ".format(error_string)
-                    raise ValueError(error_string)
+                    raise ValueError("GPSource.calculate_dxdy(): no location data for: {:s}".format(", ".join(self.missing_parameters(("dlatS", "dlonS", "latS", "lonS", "latR", "lonR")))))
                     
             if self.dlatM is None or self.dlonM is None:
                 if self.latM is not None and self.lonM is not None and self.latR is not None and self.lonR is not None:
                     self.dlatM, self.dlonM = GPF.latlon2dlatdlon(lat = self.latM, lon = self.lonM, latR = self.latR, lonR = self.lonR, verbose = verbose) 
                 else:
-                    error_string = "GPSource.calculate_dxdy(): no location data for: "
-                    if self.dlatM is None:
-                        error_string = "{:s} dlatM, ".format(error_string)
-                    if self.dlonM is None:
-                        error_string = "{:s} dlonM, ".format(error_string)
-                    if self.latM is None:
-                        error_string = "{:s} latM, ".format(error_string)
-                    if self.lonM is None:
-                        error_string = "{:s} lonM, ".format(error_string)
-                    if self.latR is None:
-                        error_string = "{:s} latR, ".format(error_string)
-                    if self.lonR is None:
-                        error_string = "{:s} lonR, ".format(error_string)
-                    raise ValueError(error_string)
+                    raise ValueError("GPSource.calculate_dxdy(): no location data for: {:s}".format(", ".join(self.missing_parameters(("dlatM", "dlonM", "latM", "lonM", "latR", "lonR")))))
             
             if self.wind_direction is None:
                 raise ValueError("GPSource.calculate_dxdy(): no data for wind_direction")
@@ -186,8 +162,19 @@ class Source(CT.ClassTools):
         
         """
     
-        verbose = GPF.print_vars(function_name = "GPSource.Source.calculate_sigma_y_z()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)          
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPSource.Source.calculate_sigma_y_z()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
+
+        self.prepare_sigma_y_z(verbose = verbose)
+            
+        self.sigma_y, self.sigma_z = GPF.calculate_sigma(dx = self.dx, z0 = self.z0, tc = self.tc, dispersion_constants = self.dispersion_constants, stability_index = self.stability_index, offset_sigma_z = self.offset_sigma_z, tc_minimum = self.tc_minimum, verbose = verbose)
 
+    def prepare_sigma_y_z(self, verbose = 0):
+        """
+        Check the variables needed for sigma y and z and calculate tc and the dispersion constants if they are missing. 
+        
+        """
         if self.dx is None:
             raise ValueError("GPSource.Source.calculate_sigma_y_z(): variable dx is missing")
         if self.z0 is None:
@@ -201,20 +188,20 @@ class Source(CT.ClassTools):
 
         if self.dispersion_constants is None:
             if self.dispersion_mode is None:
-                raise ValueError("GPSource.Source.calculate_sigma_y_z(): variable dx is missing")  
+                raise ValueError("GPSource.Source.calculate_sigma_y_z(): variable dispersion_mode is missing")  
             self.dispersion_constants = GPF.get_dispersion_constants(dispersion_mode = self.dispersion_mode)
        
         if self.stability_index is None:
             raise ValueError("GPSource.Source.calculate_sigma_y_z(): variable stability_index is missing")        
             
-        self.sigma_y, self.sigma_z = GPF.calculate_sigma(dx = self.dx, z0 = self.z0, tc = self.tc, dispersion_constants = self.dispersion_constants, stability_index = self.stability_index, offset_sigma_z = self.offset_sigma_z, tc_minimum = self.tc_minimum, verbose = verbose)
-            
     def calculate_concentration(self, molecule = None, verbose = 0, **kwargs):
         """
          
         """
     
-        verbose = GPF.print_vars(function_name = "GPSource.Source.calculate_sigma_y_z()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)   
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPSource.Source.calculate_concentration()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         if molecule is None:
             if self.molecule is None:
@@ -223,4 +210,109 @@ class Source(CT.ClassTools):
                 molecule = self.molecule
 
         return GPF.calculate_concentration(qs = self.qs, wind_speed = self.wind_speed, sigma_y = self.sigma_y, sigma_z = self.sigma_z, dy = self.dy, zr = self.zr, hs = self.hs, hm = self.hm, molecular_mass = molecule.molecular_mass, verbose = verbose)
-        
\ No newline at end of file
+
+    def calculate_sigma_and_concentration(self, molecule = None, verbose = 0, **kwargs):
+        """
+        Calculate the concentration without storing sigma y and z. 
+        
+        Does the same as `calculate_sigma_y_z()` followed by `calculate_concentration()`, in one pass with `GPFunctions.calculate_sigma_concentration()`. `sigma_y` and `sigma_z` are not set. 
+        
+        """
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GPSource.Source.calculate_sigma_and_concentration()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
+        
+        if molecule is None:
+            if self.molecule is None:
+                raise ValueError("GPSource.calculate_sigma_and_concentration(): no molecule is defined")   
+            else:
+                molecule = self.molecule
+        
+        self.prepare_sigma_y_z(verbose = verbose)
+        
+        return GPF.calculate_sigma_concentration(dx = self.dx, z0 = self.z0, tc = self.tc, dispersion_constants = self.dispersion_constants, stability_index = self.stability_index, qs = self.qs, wind_speed = self.wind_speed, dy = self.dy, zr = self.zr, hs = self.hs, hm = self.hm, molecular_mass = molecule.molecular_mass, tc_minimum = self.tc_minimum, offset_sigma_z = self.offset_sigma_z, verbose = verbose)
+        
+
+
+def calculate_sigma_y_z_sources(sources, verbose = 0):
+    """
+    Calculate sigma y and z for several sources with one call to GPFunctions.calculate_sigma(). 
+    
+    The variables of the sources are stacked in arrays with one row per source. The results are set as `sigma_y` and `sigma_z` of each source, as views of one array. The result is the same as `Source.calculate_sigma_y_z()` for each source. 
+    
+    Arguments
+    ---------
+    sources : list with Source
+        The sources. dx of all sources must have the same length, or be a number. 
+    
+    """
+    if verbose > 1:
+        GPF.print_vars(function_name = "GPSource.calculate_sigma_y_z_sources()", function_vars = vars(), verbose = verbose, self_verbose = 0)
+
+    if len(sources) == 0:
+        return
+
+    for source in sources:
+        source.prepare_sigma_y_z(verbose = verbose)
+
+    n_sources = len(sources)
+    
+    # one row per source
+    arrays = numpy.broadcast_arrays(*[s.dx for s in sources], *[s.z0 for s in sources], *[s.tc for s in sources], *[s.stability_index for s in sources])
+    dx, z0, tc, stability_index = [numpy.stack(arrays[i * n_sources:(i + 1) * n_sources]) for i in range(4)]
+    # shape to broadcast a number per source against the rows
+    shape = (-1, *[1] * (dx.ndim - 1))
+    
+    # one table for all sources: the rows of source i are i*6 ... i*6 + 5
+    dispersion_constants = numpy.concatenate([s.dispersion_constants for s in sources])
+    n_classes = sources[0].dispersion_constants.shape[0]
+    stability_index = numpy.arange(n_sources).reshape(shape) * n_classes + numpy.asarray(stability_index, dtype = int)
+    
+    offset_sigma_z = numpy.reshape([s.offset_sigma_z for s in sources], shape)
+    tc_minimum = numpy.reshape([s.tc_minimum for s in sources], shape)
+
+    sigma_y, sigma_z = GPF.calculate_sigma(dx = dx, z0 = z0, tc = tc, dispersion_constants = dispersion_constants, stability_index = stability_index, offset_sigma_z = offset_sigma_z, tc_minimum = tc_minimum, verbose = verbose)
+    
+    for source_index, source in enumerate(sources):
+        source.sigma_y = sigma_y[source_index]
+        source.sigma_z = sigma_z[source_index]
+
+
+def _stack_per_source(values):
+    """
+    Stack the values of a parameter with one row per source. If all are numbers, the shape is (n_sources, 1), so that they broadcast against the rows of the other parameters without being repeated. 
+    """
+    values = [numpy.asarray(value) for value in values]
+    if all(value.ndim == 0 for value in values):
+        return numpy.reshape(values, (-1, 1))
+    return numpy.stack(numpy.broadcast_arrays(*values))
+
+
+def calculate_concentration_sources(sources, verbose = 0):
+    """
+    Calculate the concentration of several sources with one call to GPFunctions.calculate_concentration(). 
+    
+    The result is the same as `Source.calculate_concentration()` for each source, with the molecule of the source. 
+    
+    Arguments
+    ---------
+    sources : list with Source
+        The sources, with sigma y and z calculated. The arrays of all sources must have the same length. 
+    
+    Returns
+    -------
+    conc : ndarray
+        Concentration with one row per source. 
+    
+    """
+    if verbose > 1:
+        GPF.print_vars(function_name = "GPSource.calculate_concentration_sources()", function_vars = vars(), verbose = verbose, self_verbose = 0)
+
+    for source in sources:
+        if source.molecule is None:
+            raise ValueError("GPSource.calculate_concentration_sources(): no molecule is defined for source {:}".format(source.source_id))
+
+    qs, wind_speed, sigma_y, sigma_z, dy, zr, hs, hm = [_stack_per_source([getattr(s, name) for s in sources]) for name in ("qs", "wind_speed", "sigma_y", "sigma_z", "dy", "zr", "hs", "hm")]
+    molecular_mass = _stack_per_source([s.molecule.molecular_mass for s in sources])
+
+    return GPF.calculate_concentration(qs = qs, wind_speed = wind_speed, sigma_y = sigma_y, sigma_z = sigma_z, dy = dy, zr = zr, hs = hs, hm = hm, molecular_mass = molecular_mass, verbose = verbose)
@@ -7,6 +7,7 @@ Data processing is done in three steps:
 """
 import importlib
 import pathlib
+import sys
 import pandas
 import numpy
 import matplotlib 
@@ -22,12 +23,24 @@ import GPChannel as GPCH
 import GPMolecule as GPMO
 import GPPlume as GPPL
 
-importlib.reload(GPF)
-importlib.reload(GPI)
-importlib.reload(GPSO)
-importlib.reload(GPCH)
-importlib.reload(GPMO)
-importlib.reload(GPPL)
+
+def dev_reload():
+    """
+    Reload all modules of the package, for interactive use (Jupyter, Spyder) while editing the code. 
+    
+    The modules are not reloaded when they are imported, so production code does not spend time on it and should not call this function. 
+    
+    Returns
+    -------
+    module
+        The reloaded GaussianPlume module. Use it as `GP = GP.dev_reload()`. 
+    
+    """
+    # dependencies first
+    for module in [GPF.GPC, CT, PT, GPF, GPMO, GPI, GPSO, GPCH, GPPL]:
+        importlib.reload(module)
+    return importlib.reload(sys.modules[__name__])
+
 
 class GaussianPlume(CT.ClassTools):
     """
@@ -93,7 +106,9 @@ class GaussianPlume(CT.ClassTools):
         """
         self.verbose = verbose
         
-        verbose = GPF.print_vars(function_name = "GaussianPlume.GaussianPlume.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)    
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.GaussianPlume.__init__()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         self.sources = kwargs.get("sources", None)
         self.channels = kwargs.get("channels", None)
@@ -113,6 +128,13 @@ class GaussianPlume(CT.ClassTools):
         self.df_static = kwargs.get("df_static", None)
         self.df_corrections = kwargs.get("df_corrections", None)
         
+        # wind direction with its sine and cosine, see wind_direction_sin_cos()
+        self._wind_direction_sin_cos = None
+        # column names of the DataFrames, see columns()
+        self._columns = {}
+        # arrays of the columns of df, see column()
+        self._column_arrays = (None, {})
+        
         self.filename = kwargs.get("filename", None)
         self.path = kwargs.get("path", None)
         self.paf = GPF.handle_filename_path(filename = self.filename, path = self.path, verbose = verbose)
@@ -122,7 +144,7 @@ class GaussianPlume(CT.ClassTools):
         self.concentration_model = None
         self.concentration_measured = None
 
-    def import_data(self, filename = None, path = None, verbose = 0, **kwargs):
+    def import_data(self, filename = None, path = None, use_arrow = False, cache = False, verbose = 0, **kwargs):
         """
         Import all data. 
         
@@ -134,31 +156,39 @@ class GaussianPlume(CT.ClassTools):
             Filename. For more information, see GPFunctions.handle_filename_path.
         path : Path or str (optional, None)
             Path. For more information, see GPFunctions.handle_filename_path.
+        use_arrow : bool (optional, False)
+            Read csv measurement data with pyarrow. See GPImport.import_df_from_csv.
+        cache : bool (optional, False)
+            Keep a parquet copy of csv measurement data, to skip parsing on the next import. See GPImport.import_df_from_csv.
             
         Notes
         -----
         If both `filename` and `path` are None (default), it will use the path-and-filename set during initialization. 
 
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_data()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_data()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         if filename is None and path is None:
             paf = self.paf
         else:
             paf = GPF.handle_filename_path(filename = filename, path = path, verbose = verbose)
 
-        self.import_static_parameters(verbose = verbose, **kwargs)
-        self.import_sources_from_Excel(verbose = verbose, **kwargs)
-        self.import_channels_from_Excel(verbose = verbose, **kwargs)
+        # static parameters, sources and channels are in the same workbook, parse it only once
+        with GPI.open_Excel(paf[0]) as workbook:
+            self.import_static_parameters(workbook = workbook, verbose = verbose, **kwargs)
+            self.import_sources_from_Excel(workbook = workbook, verbose = verbose, **kwargs)
+            self.import_channels_from_Excel(workbook = workbook, verbose = verbose, **kwargs)
         
         if str(self.paf_data.suffix) == ".csv":
-            self.import_measurement_data_from_csv(filename = self.paf_data, verbose = verbose)
+            self.import_measurement_data_from_csv(filename = self.paf_data, use_arrow = use_arrow, cache = cache, verbose = verbose)
         elif str(self.paf_data.suffix) == "xlsx":
             self.import_measurement_data_from_Excel(filename = self.paf_data, verbose = verbose)
         elif str(self.paf_data.suffix) == ".pickle":
             self.import_measurement_data_from_pickle(filename = self.paf_data, verbose = verbose)
             
-    def import_static_parameters(self, sheetname = "static parameters", filename = None, path = None, verbose = 0, **kwargs):
+    def import_static_parameters(self, sheetname = "static parameters", filename = None, path = None, workbook = None, verbose = 0, **kwargs):
         """
         Import static parameters. 
         
@@ -170,34 +200,40 @@ class GaussianPlume(CT.ClassTools):
             Filename. For more information, see GPFunctions.handle_filename_path.
         path : Path or str (optional, None)
             Path. For more information, see GPFunctions.handle_filename_path.
+        workbook : pandas.ExcelFile (optional, None)
+            An opened workbook. If it is given, the sheet is read from it and `filename` and `path` are ignored.
             
         Notes
         -----
         If both `filename` and `path` are None (default), it will use the path-and-filename set during initialization. 
 
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_static_parameters()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_static_parameters()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         if filename is None and path is None:
             paf = self.paf
         else:
             paf = GPF.handle_filename_path(filename = filename, path = path, verbose = verbose)
         
-        df_static = GPI.import_df_from_Excel(paf[0], sheetname, index_col = 0, header = None)   
+        df_static = GPI.import_df_from_Excel(paf[0] if workbook is None else workbook, sheetname, index_col = 0, header = None)   
 
         df_static = df_static.transpose()
         df_static = df_static.reset_index(drop = True)
 
         self.df_static = df_static
         
-        if "filename_measurement_data" in self.df_static:
+        if "filename_measurement_data" in self.columns("df_static"):
             self.paf_data = pathlib.Path(self.df_static.loc[0,"filename_measurement_data"])
     
     def import_measurement_data_from_Excel(self, sheetname = "data", filename = None, path = None, drop_non_plume = False, verbose = 0, **kwargs):
         """
         
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_measurement_data_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_measurement_data_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         paf = GPF.handle_filename_path(filename = filename, path = path, verbose = verbose)
 
@@ -212,15 +248,24 @@ class GaussianPlume(CT.ClassTools):
 
 
 
-    def import_measurement_data_from_csv(self, filename = None, path = None, drop_non_plume = False, verbose = 0, **kwargs):
+    def import_measurement_data_from_csv(self, filename = None, path = None, drop_non_plume = False, use_arrow = False, cache = False, verbose = 0, **kwargs):
         """
         
+        Arguments
+        ---------
+        use_arrow : bool (optional, False)
+            Read the file with pyarrow. See GPImport.import_df_from_csv.
+        cache : bool (optional, False)
+            Keep a parquet copy of the file. See GPImport.import_df_from_csv.
+        
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_measurement_data_from_csv()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_measurement_data_from_csv()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
  
         paf = GPF.handle_filename_path(filename = filename, path = path, verbose = verbose)
         
-        df = GPI.import_df_from_csv(paf[0]) #, parse_dates = ["datetime"])
+        df = GPI.import_df_from_csv(paf[0], use_arrow = use_arrow, cache = cache) #, parse_dates = ["datetime"])
     
         # if drop_non_plume:
             # df.drop(df.index[df['plume_number'] == 0], inplace=True)
@@ -234,7 +279,9 @@ class GaussianPlume(CT.ClassTools):
         """
         
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_measurement_data_from_pickle()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_measurement_data_from_pickle()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
  
         paf = GPF.handle_filename_path(filename = filename, path = path, verbose = verbose)
         
@@ -248,7 +295,7 @@ class GaussianPlume(CT.ClassTools):
         self.df = df
 
 
-    def import_sources_from_Excel(self, sheetname = "sources", filename = None, path = None, verbose = 0, **kwargs):
+    def import_sources_from_Excel(self, sheetname = "sources", filename = None, path = None, workbook = None, verbose = 0, **kwargs):
         """
         
         Arguments
@@ -259,6 +306,8 @@ class GaussianPlume(CT.ClassTools):
             Filename. For more information, see GPFunctions.handle_filename_path.
         path : Path or str (optional, None)
             Path. For more information, see GPFunctions.handle_filename_path.
+        workbook : pandas.ExcelFile (optional, None)
+            An opened workbook. If it is given, the sheet is read from it and `filename` and `path` are ignored.
             
         Notes
         -----
@@ -267,7 +316,9 @@ class GaussianPlume(CT.ClassTools):
             
         
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_sources_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_sources_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         if filename is None and path is None:
             paf = self.paf
@@ -277,7 +328,7 @@ class GaussianPlume(CT.ClassTools):
         if sheetname is None:
             sheetname = "sources"
 
-        self.df_sources = GPI.import_df_from_Excel(paf[0], sheetname)
+        self.df_sources = GPI.import_df_from_Excel(paf[0] if workbook is None else workbook, sheetname)
         
         n_sources = self.df_sources.shape[0]
         
@@ -303,7 +354,9 @@ class GaussianPlume(CT.ClassTools):
         """
         
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.generate_sources()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.generate_sources()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         if self.sources is None:
             if self.df_sources is not None:
@@ -314,7 +367,7 @@ class GaussianPlume(CT.ClassTools):
 
 
 
-    def import_channels_from_Excel(self, sheetname = "channels", filename = None, path = None, verbose = 0, **kwargs):
+    def import_channels_from_Excel(self, sheetname = "channels", filename = None, path = None, workbook = None, verbose = 0, **kwargs):
         """
         
         Arguments
@@ -325,6 +378,8 @@ class GaussianPlume(CT.ClassTools):
             Filename. For more information, see GPFunctions.handle_filename_path.
         path : Path or str (optional, None)
             Path. For more information, see GPFunctions.handle_filename_path.
+        workbook : pandas.ExcelFile (optional, None)
+            An opened workbook. If it is given, the sheet is read from it and `filename` and `path` are ignored.
             
         Notes
         -----
@@ -333,7 +388,9 @@ class GaussianPlume(CT.ClassTools):
             
         
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_channels_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_channels_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         if filename is None and path is None:
             paf = self.paf
@@ -343,7 +400,7 @@ class GaussianPlume(CT.ClassTools):
         if sheetname is None:
             sheetname = "channels"
 
-        df_channels = GPI.import_df_from_Excel(paf[0], sheetname)        
+        df_channels = GPI.import_df_from_Excel(paf[0] if workbook is None else workbook, sheetname)        
         
         n_channels = df_channels.shape[0]
         
@@ -383,7 +440,9 @@ class GaussianPlume(CT.ClassTools):
             
         
         """
-        verbose = GPF.print_vars(function_name = "GaussianPlume.import_plume_corrections_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.import_plume_corrections_from_Excel()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
 
         paf = GPF.handle_filename_path(filename = filename, path = path, verbose = verbose)
@@ -399,16 +458,19 @@ class GaussianPlume(CT.ClassTools):
         """
         
         """        
-        verbose = GPF.print_vars(function_name = "GaussianPlume.calculate_concentration()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)    
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.calculate_concentration()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         self.concentration_model = numpy.zeros((self.n_datapoints, self.n_molecules, self.n_sources))
         self.concentration_model[:,:,:] = numpy.nan
 
-        for molecule_index, molecule in enumerate(self.molecules):
-            for source_index, source in enumerate(self.sources):
-                if molecule.name == source.molecule.name:
-                    conc = source.calculate_concentration(verbose = verbose)
-                    self.concentration_model[:, molecule_index, source_index] = conc
+        # (molecule, source) pairs where the source emits the molecule, all sources are calculated in one go
+        pairs = [(molecule_index, source_index) for molecule_index, molecule in enumerate(self.molecules) for source_index, source in enumerate(self.sources) if molecule.name == source.molecule.name]
+        if len(pairs) > 0:
+            molecule_indices, source_indices = zip(*pairs)
+            conc = GPSO.calculate_concentration_sources([self.sources[source_index] for source_index in source_indices], verbose = verbose)
+            self.concentration_model[:, molecule_indices, source_indices] = conc.T
             
  
                         
@@ -491,7 +553,9 @@ class GaussianPlume(CT.ClassTools):
         print(res)
         
     def apply_plume_corrections(self, plume_ids = None, verbose = 0, **kwargs):
-        verbose = GPF.print_vars(function_name = "GaussianPlume.apply_plume_corrections()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose) 
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.apply_plume_corrections()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         if plume_ids is None:
             plumes = self.plumes
@@ -504,9 +568,82 @@ class GaussianPlume(CT.ClassTools):
         for plume in plumes:
             if plume.wind_direction is not None:
                 self.df.loc[plume.plume_idx,"wind_direction"] = plume.wind_direction
+        # the column may have been replaced by the assignment
+        self._column_arrays = (None, {})
+
+    def columns(self, df_name):
+        """
+        The column names of one of the DataFrames as a frozenset, for the many checks whether a column exists. 
+        
+        The set is made again when the DataFrame or its columns are replaced, for example when a column is added. 
+        
+        Arguments
+        ---------
+        df_name : str
+            Name of the attribute: "df", "df_sources", "df_channels" or "df_static". 
+        
+        Returns
+        -------
+        frozenset
+            The column names, empty if the DataFrame is None. 
+        
+        """
+        df = getattr(self, df_name)
+        if df is None:
+            return frozenset()
+        cached = self._columns.get(df_name)
+        if cached is None or cached[0] is not df.columns:
+            cached = (df.columns, frozenset(df.columns))
+            self._columns[df_name] = cached
+        return cached[1]
+
+    def column(self, label):
+        """
+        The values of a column of `df` as an ndarray, shared by all sources that use the column. 
+        
+        All sources get the same array object, so the sine and cosine of the wind direction can be reused, see `wind_direction_sin_cos()`. The arrays are cleared at the start of `parse_data()`, so values assigned to `df` are picked up. 
+        
+        Arguments
+        ---------
+        label : str
+            Column name. 
+        
+        Returns
+        -------
+        ndarray
+        
+        """
+        columns, arrays = self._column_arrays
+        if columns is not self.df.columns:
+            arrays = {}
+            self._column_arrays = (self.df.columns, arrays)
+        if label not in arrays:
+            arrays[label] = self.df[label].to_numpy()
+        return arrays[label]
+
+    def wind_direction_sin_cos(self, wind_direction):
+        """
+        Sine and cosine of the wind direction, computed once while the wind direction is the same. 
+        
+        The sources usually all take the wind direction from the measurement data, as the same array from `column()`. The cache is kept for that object and cleared at the start of `parse_data()`. 
+        
+        Returns
+        -------
+        sin_wd, cos_wd : ndarray
+        
+        """
+        if self._wind_direction_sin_cos is None or self._wind_direction_sin_cos[0] is not wind_direction:
+            self._wind_direction_sin_cos = (wind_direction, GPF.wind_direction_sin_cos(wind_direction))
+        return self._wind_direction_sin_cos[1]
 
     def parse_data(self, verbose = 0, **kwargs):
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_data()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose) 
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_data()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
+
+        # df may have been changed since the last call
+        self._column_arrays = (None, {})
+        self._wind_direction_sin_cos = None
 
         self.generate_sources(verbose = verbose, **kwargs)
 
@@ -533,7 +670,7 @@ class GaussianPlume(CT.ClassTools):
                 # calculate dx dy
                 if source.wind_direction is None:
                     raise ValueError("GaussianPlume.parse_data: No valid source for wind_direction, can't calculate distances.")
-                source.dx, source.dy = GPF.dlatdlon2dxdy(dlatS = source.dlatS, dlonS = source.dlonS, dlatM = source.dlatM, dlonM = source.dlonM, wind_direction = source.wind_direction, warn_distance_above_meter = source.warn_distance_above_meter, verbose = verbose, **kwargs)
+                source.dx, source.dy = GPF.dlatdlon2dxdy(dlatS = source.dlatS, dlonS = source.dlonS, dlatM = source.dlatM, dlonM = source.dlonM, wind_direction = source.wind_direction, warn_distance_above_meter = source.warn_distance_above_meter, sin_cos_wind_direction = self.wind_direction_sin_cos(source.wind_direction), verbose = verbose, **kwargs)
             
             self.parse_other_source_parameters(source_index, source, verbose = verbose, **kwargs)
 
@@ -548,10 +685,10 @@ class GaussianPlume(CT.ClassTools):
             
             log_label = "S{:d} tc".format(source.source_id)
             if source.tc is None:
-                if self.df_sources is not None and "tc" in self.df_sources:
+                if "tc" in self.columns("df_sources"):
                     source.tc = self.df_sources.loc[source_index,"tc"]
                     self.log[log_label] = "from df_sources"
-                elif self.df_static is not None and "tc" in self.df_static:
+                elif "tc" in self.columns("df_static"):
                     source.tc = self.df_static.loc[source_index,"tc"]
                     self.log[log_label] = "from df_static"              
                 else:
@@ -562,11 +699,12 @@ class GaussianPlume(CT.ClassTools):
 
             log_label = "S{:d} sigma y and z".format(source.source_id)
             if source.sigma_y is None or source.sigma_z is None:
-                source.calculate_sigma_y_z(verbose = verbose)
                 self.log[log_label] = "calculated during parse_data"
             else:
                 self.log[log_label] = "set earlier"     
 
+        # sigma y and z of all sources in one go
+        GPSO.calculate_sigma_y_z_sources([source for source in self.sources if source.sigma_y is None or source.sigma_z is None], verbose = verbose)
 
         for channel_index, channel in enumerate(self.channels):
             self.parse_channel_parameters(channel_index, channel, verbose = 0, **kwargs)
@@ -576,15 +714,17 @@ class GaussianPlume(CT.ClassTools):
             
     def parse_channel_parameters(self, channel_index, channel, verbose = 0, **kwargs):
     
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_channel_parameters()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose) 
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_channel_parameters()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         label = "ppb C{:d}".format(channel.channel_id)
-        self.concentration_measured[:,channel_index] = self.df.loc[:,label].to_numpy()
+        self.concentration_measured[:,channel_index] = self.df[label].to_numpy()
                     
         log_label = "C{:d} plume_number".format(channel.channel_id)
         if channel.plume_number is None:
-            if self.df is not None and "plume_number" in self.df:
-                channel.plume_number = self.df.loc[:,"plume_number"].to_numpy()
+            if "plume_number" in self.columns("df"):
+                channel.plume_number = self.df["plume_number"].to_numpy()
                 idx = numpy.isnan(channel.plume_number)
                 channel.plume_number[idx] = 0
                 channel.plume_number = numpy.asarray(channel.plume_number, dtype = int)
@@ -599,7 +739,9 @@ class GaussianPlume(CT.ClassTools):
     def parse_source_parameter(self, destination, label, parse_order, index, obj, default = None, verbose = 0, **kwargs):
     
     
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_source_parameter()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose) 
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_source_parameter()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         if type(obj) == GPSO.Source:
             log_label = "{:s} S{:}".format(label, obj.source_id)
@@ -618,14 +760,14 @@ class GaussianPlume(CT.ClassTools):
         for p in parse_order:
             if destination is not None:
                 return destination           
-            if p == "df_sources" and self.df_sources is not None and label in self.df_sources:
+            if p == "df_sources" and label in self.columns("df_sources"):
                 temp = self.df_sources.loc[index,label]
                 if numpy.isnan(temp):
                     self.log[log_label] = "df_sources is nan, not set"
                 else:
                     destination = temp
                     self.log[log_label] = "from df_sources"
-            elif p == "df_static" and self.df_static is not None and label in self.df_static:
+            elif p == "df_static" and label in self.columns("df_static"):
                 temp = self.df_static.loc[0,label]
                 if numpy.isnan(temp):
                     self.log[log_label] = "df_static is nan, not set"
@@ -634,10 +776,10 @@ class GaussianPlume(CT.ClassTools):
                     self.log[log_label] = "from df_static"    
             elif p in ["df", "df SX"] and self.df is not None:
                 
-                if label in self.df:
-                    temp = self.df.loc[:,label].to_numpy()
-                elif label_SX in self.df:
-                    temp = self.df.loc[:,label_SX].to_numpy()
+                if label in self.columns("df"):
+                    temp = self.column(label)
+                elif label_SX in self.columns("df"):
+                    temp = self.column(label_SX)
                 else:
                     temp = None
                     
@@ -669,17 +811,19 @@ class GaussianPlume(CT.ClassTools):
 
 
     def parse_other_source_parameters(self, source_index, source, verbose = 0, **kwargs):
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_other_source_parameters()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose) 
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_other_source_parameters()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
         
         # parse_order = ["sources", "static", "error"]
         # source.qs = self.parse_source_parameter(destination = source.qs, label = "qs", parse_order = parse_order, index = source_index, obj = source, verbose = verbose)
         
         log_label = "S{:d} qs".format(source.source_id)
         if source.qs is None:
-            if self.df_sources is not None and "qs" in self.df_sources:
+            if "qs" in self.columns("df_sources"):
                 source.qs = self.df_sources.loc[source_index,"qs"]
                 self.log[log_label] = "from df_sources"
-            elif self.df_static is not None and "qs" in self.df_static:
+            elif "qs" in self.columns("df_static"):
                 source.qs = self.df_static["qs"].to_numpy()[0]
                 self.log[log_label] = "from df_static"  
             else:
@@ -691,17 +835,17 @@ class GaussianPlume(CT.ClassTools):
         log_label = "S{:d} hs".format(source.source_id)
         label = "hs S{:}".format(source.source_id)
         if source.hs is None:
-            if self.df_sources is not None and "hs" in self.df_sources:
+            if "hs" in self.columns("df_sources"):
                 source.hs = self.df_sources.loc[source_index,"hs"]
                 self.log[log_label] = "from df_sources"
-            elif self.df_static is not None and "hs" in self.df_static:
+            elif "hs" in self.columns("df_static"):
                 source.hs = self.df_static["hs"].to_numpy()[0]
                 self.log[log_label] = "from df_static"  
-            elif self.df is not None and label in self.df:
-                source.hs = self.df.loc[:,label].to_numpy()
+            elif label in self.columns("df"):
+                source.hs = self.column(label)
                 self.log[log_label] = "from df SX"     
-            elif self.df is not None and "hs" in self.df:
-                source.hs = self.df.loc[:,"hs"].to_numpy()
+            elif "hs" in self.columns("df"):
+                source.hs = self.column("hs")
                 self.log[log_label] = "from df"                     
             else:
                 self.log[log_label] = "not set"
@@ -711,13 +855,13 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} hm".format(source.source_id)
         if source.hm is None:
-            if self.df_sources is not None and "hm" in self.df_sources:
+            if "hm" in self.columns("df_sources"):
                 source.hm = self.df_sources.loc[source_index,"hm"]
                 self.log[log_label] = "from df_sources"
-            elif self.df is not None and "hm" in self.df:
-                source.hm = self.df.loc[:,"hm"].to_numpy()
+            elif "hm" in self.columns("df"):
+                source.hm = self.column("hm")
                 self.log[log_label] = "from df"                
-            elif self.df_static is not None and "hm" in self.df_static:
+            elif "hm" in self.columns("df_static"):
                 source.hm = self.df_static["hm"].to_numpy()[0]
                 self.log[log_label] = "from df_static"  
             else:
@@ -728,10 +872,10 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} z0".format(source.source_id)
         if source.z0 is None:
-            if self.df_sources is not None and "z0" in self.df_sources:
+            if "z0" in self.columns("df_sources"):
                 source.z0 = self.df_sources.loc[source_index,"z0"]
                 self.log[log_label] = "from df_sources"
-            elif self.df_static is not None and "z0" in self.df_static:
+            elif "z0" in self.columns("df_static"):
                 source.z0 = self.df_static["z0"].to_numpy()[0]
                 self.log[log_label] = "from df_static"  
             else:
@@ -742,13 +886,13 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} zr".format(source.source_id)
         if source.zr is None:
-            if self.df_sources is not None and "zr" in self.df_sources:
+            if "zr" in self.columns("df_sources"):
                 source.zr = self.df_sources.loc[source_index,"zr"]
                 self.log[log_label] = "from df_sources"
-            elif self.df is not None and "zr" in self.df:
-                source.zr = self.df.loc[:,"zr"].to_numpy()
+            elif "zr" in self.columns("df"):
+                source.zr = self.column("zr")
                 self.log[log_label] = "from df"                
-            elif self.df_static is not None and "zr" in self.df_static:
+            elif "zr" in self.columns("df_static"):
                 source.zr = self.df_static["zr"].to_numpy()[0]
                 self.log[log_label] = "from df_static"  
             else:
@@ -759,7 +903,7 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} offset_sigma_z".format(source.source_id)
         if source.offset_sigma_z is None:
-            if self.df_sources is not None and "offset_sigma_z" in self.df_sources:
+            if "offset_sigma_z" in self.columns("df_sources"):
                 source.offset_sigma_z = self.df_sources.loc[source_index,"offset_sigma_z"]
                 self.log[log_label] = "from df_sources"
             else:
@@ -770,7 +914,7 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} dispersion_mode".format(source.source_id)
         if source.dispersion_mode is None:
-            if self.df_static is not None and "dispersion_mode" in self.df_static:
+            if "dispersion_mode" in self.columns("df_static"):
                 source.dispersion_mode = self.df_static.loc[0,"dispersion_mode"]
                 self.log[log_label] = "from df_static"
             else:
@@ -782,10 +926,10 @@ class GaussianPlume(CT.ClassTools):
         # first check for stability index. When this is set, stability_class is also set. I.e. it won't look for stability_class anymore. 
         log_label = "S{:d} stability_index".format(source.source_id)
         if source.stability_index is None:
-            if self.df is not None and "stability_index" in self.df:
-                source.stability_index = self.df.loc[:,"stability_index"].to_numpy()
+            if "stability_index" in self.columns("df"):
+                source.stability_index = self.column("stability_index")
                 self.log[log_label] = "from df"
-            elif self.df_static is not None and "stability_index" in self.df_static:
+            elif "stability_index" in self.columns("df_static"):
                 source.stability_index = self.df_static.loc[0,"stability_index"]
                 self.log[log_label] = "from df_static"                  
             else:
@@ -797,10 +941,10 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} stability_class".format(source.source_id)
         if source.stability_class is None:
-            if self.df is not None and "stability_class" in self.df:
-                source.stability_class = self.df.loc[:,"stability_class"].to_numpy()
+            if "stability_class" in self.columns("df"):
+                source.stability_class = self.column("stability_class")
                 self.log[log_label] = "from df"
-            elif self.df_static is not None and "stability_class" in self.df_static:
+            elif "stability_class" in self.columns("df_static"):
                 source.stability_class = self.df_static.loc[0,"stability_class"]
                 self.log[log_label] = "from df_static"                  
             else:
@@ -812,10 +956,10 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} tc_minimum".format(source.source_id)
         if source.tc_minimum is None:
-            if self.df_sources is not None and "tc_minimum" in self.df_sources:
+            if "tc_minimum" in self.columns("df_sources"):
                 source.tc_minimum = self.df_sources.loc[source_index,"tc_minimum"]
                 self.log[log_label] = "from df_sources"
-            elif self.df_static is not None and "tc_minimum" in self.df_static:
+            elif "tc_minimum" in self.columns("df_static"):
                 source.tc_minimum = self.df_static.loc[0,"tc_minimum"]
                 self.log[log_label] = "from df_static"              
             else:
@@ -856,14 +1000,16 @@ class GaussianPlume(CT.ClassTools):
         
         """
     
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_data_dx_dy()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_data_dx_dy()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         log_label = "S{:d} wind_direction".format(source.source_id)
         if source.wind_direction is None:
-            if self.df is not None and "wind_direction" in self.df:
-                source.wind_direction = self.df.loc[:,"wind_direction"].to_numpy()
+            if "wind_direction" in self.columns("df"):
+                source.wind_direction = self.column("wind_direction")
                 self.log[log_label] = "from df"
-            elif self.df_static is not None and "wind_direction" in self.df_static:
+            elif "wind_direction" in self.columns("df_static"):
                 source.wind_direction = self.df_static.loc[source_index,"wind_direction"]
                 self.log[log_label] = "from df_static"  
             else:
@@ -875,10 +1021,10 @@ class GaussianPlume(CT.ClassTools):
 
         log_label = "S{:d} wind_speed".format(source.source_id)
         if source.wind_speed is None:
-            if self.df is not None and "wind_speed" in self.df:
-                source.wind_speed = self.df.loc[:,"wind_speed"].to_numpy()
+            if "wind_speed" in self.columns("df"):
+                source.wind_speed = self.column("wind_speed")
                 self.log[log_label] = "from df"
-            elif self.df_static is not None and "wind_speed" in self.df_static:
+            elif "wind_speed" in self.columns("df_static"):
                 source.wind_speed = self.df_static.loc[source_index,"wind_speed"]
                 self.log[log_label] = "from df_static"  
             else:
@@ -913,19 +1059,21 @@ class GaussianPlume(CT.ClassTools):
         
         """
         
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_dx_dy()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)  
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_dx_dy()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         log_label = "S{:d} dx".format(source.source_id)
         if source.dx is None:
             label = "dxS{:d}".format(source.source_id)
-            if self.df is not None and label in self.df:
-                source.dx = self.df.loc[:,label].to_numpy()
+            if label in self.columns("df"):
+                source.dx = self.column(label)
                 self.log[log_label] = "from df SX"
-            elif self.df_sources is not None and "dx" in self.df_sources:
+            elif "dx" in self.columns("df_sources"):
                 source.dx = self.df_sources.loc[source_index,"dx"]
                 self.log[log_label] = "from df_sources"
-            elif self.df is not None and "dxS" in self.df:
-                source.dx = self.df.loc[:,"dxS"].to_numpy()   
+            elif "dxS" in self.columns("df"):
+                source.dx = self.column("dxS")   
                 self.log[log_label] = "from df S"    
             else:
                 self.log[log_label] = "not set"
@@ -937,14 +1085,14 @@ class GaussianPlume(CT.ClassTools):
         log_label = "S{:d} dy".format(source.source_id)
         if source.dy is None:
             label = "dyS{:d}".format(source.source_id)
-            if self.df is not None and label in self.df:
-                source.dy = self.df.loc[:,label].to_numpy()
+            if label in self.columns("df"):
+                source.dy = self.column(label)
                 self.log[log_label] = "from df SX"
-            elif self.df_sources is not None and "dy" in self.df_sources:
+            elif "dy" in self.columns("df_sources"):
                 source.dy = self.df_sources.loc[source_index,"dy"]
                 self.log[log_label] = "from df_sources"
-            elif self.df is not None and "dyS" in self.df:
-                source.dy = self.df.loc[:,"dyS"].to_numpy()   
+            elif "dyS" in self.columns("df"):
+                source.dy = self.column("dyS")   
                 self.log[log_label] = "from df S"                      
             else:
                 self.log[log_label] = "not set"
@@ -963,11 +1111,13 @@ class GaussianPlume(CT.ClassTools):
         """
         
         """        
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_dlat_dlon()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)    
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_dlat_dlon()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         log_label = "S{:d} warn_distance_above_meter".format(source.source_id)
         if source.warn_distance_above_meter is None:
-            if self.df_sources is not None and "warn_distance_above_meter" in self.df_static:
+            if "warn_distance_above_meter" in self.columns("df_static"):
                 source.warn_distance_above_meter = self.df_static.loc[0,"warn_distance_above_meter"]
                 self.log[log_label] = "from df_static"
             else:
@@ -977,14 +1127,14 @@ class GaussianPlume(CT.ClassTools):
         log_label = "S{:d} dlatS".format(source.source_id)
         if source.dlatS is None:
             label = "dlatS{:d}".format(source.source_id)
-            if self.df is not None and label in self.df:
-                source.dlatS = self.df.loc[:,label].to_numpy()
+            if label in self.columns("df"):
+                source.dlatS = self.column(label)
                 self.log[log_label] = "from df SX"
-            elif self.df_sources is not None and "dlatS" in self.df_sources:
+            elif "dlatS" in self.columns("df_sources"):
                 source.dlatS = self.df_sources.loc[source_index,"dlatS"]
                 self.log[log_label] = "from df_sources"
-            elif self.df is not None and "dlatS" in self.df:
-                source.dlatS = self.df.loc[:,"dlatS"].to_numpy()   
+            elif "dlatS" in self.columns("df"):
+                source.dlatS = self.column("dlatS")   
                 self.log[log_label] = "from df S"    
             else:
                 self.log[log_label] = "not set"
@@ -996,14 +1146,14 @@ class GaussianPlume(CT.ClassTools):
         log_label = "S{:d} dlonS".format(source.source_id)
         if source.dlonS is None:
             label = "dlonS{:d}".format(source.source_id)
-            if self.df is not None and label in self.df:
-                source.dlonS = self.df.loc[:,label].to_numpy()
+            if label in self.columns("df"):
+                source.dlonS = self.column(label)
                 self.log[log_label] = "from df SX"
-            elif self.df_sources is not None and "dlonS" in self.df_sources:
+            elif "dlonS" in self.columns("df_sources"):
                 source.dlonS = self.df_sources.loc[source_index,"dlonS"]
                 self.log[log_label] = "from df_sources"
-            elif self.df is not None and "dlonS" in self.df:
-                source.dlonS = self.df.loc[:,"dlonS"].to_numpy()   
+            elif "dlonS" in self.columns("df"):
+                source.dlonS = self.column("dlonS")   
                 self.log[log_label] = "from df S"    
             else:
                 self.log[log_label] = "not set"
@@ -1019,10 +1169,10 @@ class GaussianPlume(CT.ClassTools):
         log_label = "S{:d} dlatM".format(source.source_id)
         if source.dlatM is None:
             label = "dlatM{:d}".format(source.source_id)
-            if self.df is not None and label in self.df:
-                source.dlatM = self.df.loc[:,label].to_numpy()
+            if label in self.columns("df"):
+                source.dlatM = self.column(label)
                 self.log[log_label] = "from df"
-            elif self.df_static is not None and "dlatM" in self.df_static:
+            elif "dlatM" in self.columns("df_static"):
                 source.dlatM = self.df_static.loc[source_index,"dlatM"]
                 self.log[log_label] = "from df_static"  
             else:
@@ -1035,10 +1185,10 @@ class GaussianPlume(CT.ClassTools):
         log_label = "S{:d} dlonM".format(source.source_id)
         if source.dlonM is None:
             label = "dlonM{:d}".format(source.source_id)
-            if self.df is not None and label in self.df:
-                source.dlonM = self.df.loc[:,label].to_numpy()
+            if label in self.columns("df"):
+                source.dlonM = self.column(label)
                 self.log[log_label] = "from df"
-            elif self.df_static is not None and "dlonM" in self.df_static:
+            elif "dlonM" in self.columns("df_static"):
                 source.dlonM = self.df_static.loc[source_index,"dlonM"]
                 self.log[log_label] = "from df_static"  
             else:
@@ -1058,13 +1208,15 @@ class GaussianPlume(CT.ClassTools):
         """
         
         """        
-        verbose = GPF.print_vars(function_name = "GaussianPlume.parse_lat_lon()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)    
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.parse_lat_lon()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         # the distances to the reference is missing for the source, the measurement. First check if the reference position is known. 
         if flag_dlatS_dlonS == False or flag_dlatM_dlonM == False:
             log_label = "S{:d} latR".format(source.source_id)
             if source.latR is None:
-                if self.df_static is not None and "latR" in self.df_static:
+                if "latR" in self.columns("df_static"):
                     source.latR = self.df_static.loc[0,"latR"]
                     self.log[log_label] = "from df_static" 
                 else:
@@ -1075,7 +1227,7 @@ class GaussianPlume(CT.ClassTools):
 
             log_label = "S{:d} lonR".format(source.source_id)
             if source.lonR is None:
-                if self.df_static is not None and "lonR" in self.df_static:
+                if "lonR" in self.columns("df_static"):
                     source.lonR = self.df_static.loc[0,"lonR"]
                     self.log[log_label] = "from df_static" 
                 else:
@@ -1091,14 +1243,14 @@ class GaussianPlume(CT.ClassTools):
             log_label = "S{:d} latS".format(source.source_id)
             if source.latS is None:
                 label = "latS{:d}".format(source.source_id)
-                if self.df is not None and label in self.df:
-                    source.latS = self.df.loc[:,label].to_numpy()
+                if label in self.columns("df"):
+                    source.latS = self.column(label)
                     self.log[log_label] = "from df SX"
-                elif self.df_sources is not None and "latS" in self.df_sources:
+                elif "latS" in self.columns("df_sources"):
                     source.latS = self.df_sources.loc[source_index,"latS"]
                     self.log[log_label] = "from df_sources"
-                elif self.df is not None and "latS" in self.df:
-                    source.latS = self.df.loc[:,"latS"].to_numpy()   
+                elif "latS" in self.columns("df"):
+                    source.latS = self.column("latS")   
                     self.log[log_label] = "from df S"    
                 else:
                     self.log[log_label] = "not set"
@@ -1109,14 +1261,14 @@ class GaussianPlume(CT.ClassTools):
             log_label = "S{:d} lonS".format(source.source_id)
             if source.lonS is None:
                 label = "lonS{:d}".format(source.source_id)
-                if self.df is not None and label in self.df:
-                    source.lonS = self.df.loc[:,label].to_numpy()
+                if label in self.columns("df"):
+                    source.lonS = self.column(label)
                     self.log[log_label] = "from df SX"
-                elif self.df_sources is not None and "lonS" in self.df_sources:
+                elif "lonS" in self.columns("df_sources"):
                     source.lonS = self.df_sources.loc[source_index,"lonS"]
                     self.log[log_label] = "from df_sources"
-                elif self.df is not None and "lonS" in self.df:
-                    source.lonS = self.df.loc[:,"lonS"].to_numpy()   
+                elif "lonS" in self.columns("df"):
+                    source.lonS = self.column("lonS")   
                     self.log[log_label] = "from df S"    
                 else:
                     self.log[log_label] = "not set"
@@ -1132,10 +1284,10 @@ class GaussianPlume(CT.ClassTools):
         if flag_dlatM_dlonM == False:
             log_label = "S{:d} latM".format(source.source_id)
             if source.latM is None:
-                if self.df is not None and "latM" in self.df:
-                    source.latM = self.df.loc[:,"latM"].to_numpy()
+                if "latM" in self.columns("df"):
+                    source.latM = self.column("latM")
                     self.log[log_label] = "from df"
-                elif self.df_static is not None and "latM" in self.df_static:
+                elif "latM" in self.columns("df_static"):
                     source.latM = self.df_static["latM"].to_numpy()[0]
                     self.log[log_label] = "from df_static" 
                 else:
@@ -1146,10 +1298,10 @@ class GaussianPlume(CT.ClassTools):
 
             log_label = "S{:d} lonM".format(source.source_id)
             if source.lonM is None:
-                if self.df is not None and "lonM" in self.df:
-                    source.lonM = self.df.loc[:,"lonM"].to_numpy()
+                if "lonM" in self.columns("df"):
+                    source.lonM = self.column("lonM")
                     self.log[log_label] = "from df"
-                elif self.df_static is not None and "lonM" in self.df_static:
+                elif "lonM" in self.columns("df_static"):
                     source.lonM = self.df_static["lonM"].to_numpy()[0]
                     self.log[log_label] = "from df_static" 
                 else:
@@ -1184,7 +1336,9 @@ class GaussianPlume(CT.ClassTools):
             If True, sum all data. If False, return as an array. 
             
         """        
-        verbose = GPF.print_vars(function_name = "GaussianPlume.get_concentration()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)    
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.get_concentration()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         if type(plume) in (list, numpy.ndarray):
             idx = numpy.array([], dtype = int)
@@ -1235,7 +1389,9 @@ class GaussianPlume(CT.ClassTools):
     def plot_results(self, plume, molecule, axi = None, verbose = 0, **kwargs):
         
 
-        verbose = GPF.print_vars(function_name = "GaussianPlume.plot_results()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)    
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.plot_results()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         flag_show_plot = False
         if axi is None:
@@ -1276,7 +1432,9 @@ class GaussianPlume(CT.ClassTools):
 
     def plot_measuremements_timeframe(self, start_time, end_time, normalize_signal = False, verbose = 0, **kwargs):
 
-        verbose = GPF.print_vars(function_name = "GaussianPlume.plot_measuremements_timeframe()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)    
+        verbose = max(verbose, self.verbose)
+        if verbose > 1:
+            GPF.print_vars(function_name = "GaussianPlume.plot_measuremements_timeframe()", function_vars = vars(), verbose = verbose, self_verbose = self.verbose)
 
         idx = numpy.where(numpy.logical_and(self.df["datetime"] > start_time, self.df["datetime"] < end_time))[0]
         
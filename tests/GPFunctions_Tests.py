@@ -233,6 +233,11 @@ class Test_dlatdlon2dxdy(unittest.TestCase):
         self.assertTrue(numpy.allclose(dx_expected, dx))
         self.assertTrue(numpy.allclose(dy_expected, dy))
 
+        # with the sine and cosine computed beforehand
+        dx, dy = GPF.dlatdlon2dxdy(dlatS, dlonS, dlatM, dlonM, None, sin_cos_wind_direction = GPF.wind_direction_sin_cos(wind_direction), verbose = self.verbose)
+
+        self.assertTrue(numpy.allclose(dx_expected, dx))
+        self.assertTrue(numpy.allclose(dy_expected, dy))
 
 
 
@@ -286,6 +291,52 @@ class Test_dlatdlon2dxdy(unittest.TestCase):
         self.assertTrue(numpy.allclose(dy_expected, dy))
 
 
+class Test_latlon2dxdy(unittest.TestCase):
+
+    def setUp(self):
+        self.verbose = 1
+
+    def test_same_as_two_steps(self):
+        """
+        latlon2dxdy should give the same result as latlon2dlatdlon followed by dlatdlon2dxdy.
+        """
+        latS = numpy.array([53.2835083, 53.29, 53.27, 53.28])
+        lonS = numpy.array([6.30388, 6.31, 6.29, 6.30])
+        latM = numpy.full(4, 53.2838)
+        lonM = numpy.full(4, 6.3030)
+        latR = 53.28375
+        lonR = 6.3024917
+        wind_direction = numpy.array([0, 90, 225, 300])
+
+        dlatS, dlonS = GPF.latlon2dlatdlon(latS, lonS, latR, lonR, verbose = self.verbose)
+        dlatM, dlonM = GPF.latlon2dlatdlon(latM, lonM, latR, lonR, verbose = self.verbose)
+        dx_expected, dy_expected = GPF.dlatdlon2dxdy(dlatS, dlonS, dlatM, dlonM, wind_direction, verbose = self.verbose)
+
+        dx, dy = GPF.latlon2dxdy(latS, lonS, latM, lonM, latR, lonR, wind_direction, verbose = self.verbose)
+
+        self.assertTrue(numpy.allclose(dx_expected, dx))
+        self.assertTrue(numpy.allclose(dy_expected, dy))
+
+        dx, dy = GPF.latlon2dxdy(latS, lonS, latM, lonM, latR, lonR, None, sin_cos_wind_direction = GPF.wind_direction_sin_cos(wind_direction), verbose = self.verbose)
+
+        self.assertTrue(numpy.allclose(dx_expected, dx))
+        self.assertTrue(numpy.allclose(dy_expected, dy))
+
+    def test_warning(self):
+        with self.assertWarns(UserWarning):
+            GPF.latlon2dxdy(52.0, 0, 50.0, 0, 51.0, 0, 0, verbose = self.verbose)
+
+    def test_warning_switched_off(self):
+        for warn_distance_above_meter in [None, numpy.inf]:
+            with self.subTest(warn_distance_above_meter):
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error")
+                    GPF.latlon2dxdy(52.0, 0, 50.0, 0, 51.0, 0, 0, warn_distance_above_meter = warn_distance_above_meter, verbose = self.verbose)
+                    GPF.latlon2dlatdlon(52.0, 0, 50.0, 0, warn_distance_above_meter = warn_distance_above_meter, verbose = self.verbose)
+                    GPF.latlon2dlatdlon(numpy.array([52.0]), 0, 50.0, 0, warn_distance_above_meter = warn_distance_above_meter, verbose = self.verbose)
+                    GPF.dlatdlon2dxdy(200000, 0, 0, 0, 0, warn_distance_above_meter = warn_distance_above_meter, verbose = self.verbose)
+
+
 class Test_calculate_sigma(unittest.TestCase):
 
     def setUp(self):
@@ -327,12 +378,80 @@ class Test_calculate_sigma(unittest.TestCase):
         dispersion_constants = GPF.get_dispersion_constants(mode, verbose = self.verbose)
         
         sigma_y, sigma_z = GPF.calculate_sigma(dx, z0, Tc, dispersion_constants, stability, verbose = self.verbose)
-        
-        
+
+
 
         self.assertTrue(numpy.allclose(sigma_y, sigma_y_expected))
         self.assertTrue(numpy.allclose(sigma_z, sigma_z_expected))
-        
+
+    def test_with_ndarray(self):
+        """
+        Compare with the power laws written out.
+        """
+        dx = numpy.array([1.0, 50, 100, 1e4])
+        z0 = 0.3
+        Tc = numpy.array([1.0, 2, 3, 4])
+        ca = 0.53
+        cb = -0.22
+        stability = numpy.array([0, 1, 3, 5])
+
+        dispersion_constants = GPF.get_dispersion_constants("farm", verbose = self.verbose)
+        dc = dispersion_constants[stability]
+
+        sigma_y_expected = dc[:,0] * dx**dc[:,1] * z0**0.2 * Tc**0.35
+        sigma_z_expected = dc[:,2] * dx**dc[:,3] * (10 * z0)**(ca * dx**cb)
+
+        sigma_y, sigma_z = GPF.calculate_sigma(dx, z0, Tc, dispersion_constants, stability, verbose = self.verbose, ca = ca, cb = cb)
+
+        self.assertTrue(numpy.allclose(sigma_y, sigma_y_expected))
+        self.assertTrue(numpy.allclose(sigma_z, sigma_z_expected))
+
+        sigma_y, sigma_z = GPF.calculate_sigma(dx, z0, Tc, dispersion_constants, stability, dtype = numpy.float32, verbose = self.verbose, ca = ca, cb = cb)
+
+        self.assertEqual(sigma_y.dtype, numpy.float32)
+        self.assertEqual(sigma_z.dtype, numpy.float32)
+        self.assertTrue(numpy.allclose(sigma_y, sigma_y_expected, rtol = 1e-5))
+        self.assertTrue(numpy.allclose(sigma_z, sigma_z_expected, rtol = 1e-5))
+
+    def test_dx_zero(self):
+        """
+        dx == 0 gives sigma_y and sigma_z of 0, also for z0 == 0.1 where 10 * z0 == 1.
+        """
+        dx = numpy.zeros(6)
+        z0 = 0.1
+        Tc = 10
+        stability = numpy.arange(6)
+
+        dispersion_constants = GPF.get_dispersion_constants("farm", verbose = self.verbose)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            sigma_y, sigma_z = GPF.calculate_sigma(dx, z0, Tc, dispersion_constants, stability, verbose = self.verbose)
+
+        numpy.testing.assert_array_equal(sigma_y, 0)
+        numpy.testing.assert_array_equal(sigma_z, 0)
+
+    def test_negative_dx_and_tc_minimum(self):
+        """
+        Negative dx gives nan, tc is raised to tc_minimum and the input arrays are not changed.
+        """
+        dx = numpy.array([-10.0, 100, 100])
+        z0 = 0.3
+        Tc = numpy.array([1.0, 1, 30])
+        stability = 2
+
+        dispersion_constants = GPF.get_dispersion_constants("farm", verbose = self.verbose)
+
+        sigma_y, sigma_z = GPF.calculate_sigma(dx, z0, Tc, dispersion_constants, stability, tc_minimum = 10, verbose = self.verbose)
+        sigma_y_10, sigma_z_10 = GPF.calculate_sigma(100, z0, 10, dispersion_constants, stability, verbose = self.verbose)
+
+        self.assertTrue(numpy.isnan(sigma_y[0]))
+        self.assertTrue(numpy.isnan(sigma_z[0]))
+        self.assertTrue(numpy.allclose(sigma_y[1], sigma_y_10))
+        self.assertFalse(numpy.allclose(sigma_y[2], sigma_y_10))
+        self.assertTrue(numpy.all(dx == numpy.array([-10.0, 100, 100])))
+        self.assertTrue(numpy.all(Tc == numpy.array([1.0, 1, 30])))
+
 
 class Test_calculate_concentration(unittest.TestCase):
 
@@ -384,8 +503,142 @@ class Test_calculate_concentration(unittest.TestCase):
         c = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, verbose = self.verbose)
         # print(c)
 
+    def test_with_ndarray(self):
+        """
+        Compare with the formula written out term by term.
+        """
+        Qs = 1
+        wind_speed = numpy.array([1, 2, 5, 10])
+        sigma_y = numpy.array([200, 50, 10, 1])
+        sigma_z = numpy.array([10, 20, 5, 1])
+        dy = numpy.array([50, 0, -5, 1])
+        Zr = 5
+        Hs = numpy.array([5, 10, 2, 3])
+        Hm = 500
+        molecular_mass = 16
+
+        A = Qs / (2 * numpy.pi * wind_speed * sigma_y * sigma_z)
+        B = numpy.exp(-dy**2 / (2 * sigma_y**2))
+        C = 2 * sigma_z**2
+        D = numpy.exp(-(Zr - Hs)**2 / C)
+        E = numpy.exp(-(Zr + Hs)**2 / C)
+        F = numpy.exp(-(Zr - (2 * Hm - Hs))**2 / C)
+        c_expected = GPC.liter_per_mole_air * 1e6 * A * B * (D + E + F) / molecular_mass
+
+        c = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, verbose = self.verbose)
+
+        self.assertTrue(numpy.allclose(c, c_expected))
+
+    def test_grid(self):
+        """
+        With grid = True every time is combined with every point, the same as tiling the inputs.
+        """
+        Qs = 1
+        wind_speed = numpy.array([1, 2, 5])
+        sigma_y = numpy.array([200, 50, 10])
+        sigma_z = numpy.array([10, 20, 5])
+        dy = numpy.array([50, 0, -5, 1])
+        Zr = numpy.array([5, 2, 1, 3])
+        Hs = 5
+        Hm = 500
+        molecular_mass = 16
+
+        c_expected = GPF.calculate_concentration(Qs, wind_speed[:,None].repeat(4, axis = 1), sigma_y[:,None].repeat(4, axis = 1), sigma_z[:,None].repeat(4, axis = 1), numpy.tile(dy, (3,1)), numpy.tile(Zr, (3,1)), Hs, Hm, molecular_mass, verbose = self.verbose)
+
+        c = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, grid = True, verbose = self.verbose)
+
+        self.assertEqual(c.shape, (3, 4))
+        self.assertTrue(numpy.allclose(c, c_expected))
+
+    def test_grid_per_time(self):
+        """
+        With grid = True, source strength and heights per time give the same as a loop over time.
+        """
+        Qs = numpy.array([1, 2, 0.5])
+        wind_speed = numpy.array([1, 2, 5])
+        sigma_y = numpy.array([200, 50, 10])
+        sigma_z = numpy.array([10, 20, 5])
+        dy = numpy.array([50, 0, -5, 1])
+        Zr = 5
+        Hs = numpy.array([5, 10, 2])
+        Hm = numpy.array([500, 300, 1000])
+        molecular_mass = 16
+
+        c = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, grid = True, verbose = self.verbose)
+
+        self.assertEqual(c.shape, (3, 4))
+        for i in range(3):
+            with self.subTest(i):
+                c_expected = GPF.calculate_concentration(Qs[i], wind_speed[i], sigma_y[i], sigma_z[i], dy, Zr, Hs[i], Hm[i], molecular_mass, verbose = self.verbose)
+                self.assertTrue(numpy.allclose(c[i], c_expected))
+
+    def test_batch(self):
+        """
+        The result in blocks is the same as in one go, also when the last block is not full.
+        """
+        n = 10
+        Qs = numpy.linspace(0.5, 2, n)
+        wind_speed = numpy.linspace(1, 10, n)
+        sigma_y = numpy.linspace(200, 10, n)
+        sigma_z = numpy.linspace(5, 20, n)
+        dy = numpy.array([50, 0, -5, 1])
+        Zr = 5
+        Hs = 5
+        Hm = 500
+        molecular_mass = 16
+
+        c_expected = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, grid = True, verbose = self.verbose)
+        c = GPF.calculate_concentration_batch(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, block_size = 3, verbose = self.verbose)
+
+        self.assertEqual(c.shape, (n, 4))
+        self.assertTrue(numpy.allclose(c, c_expected))
+
+    def test_float32(self):
+        """
+        float32 gives a float32 result, close to the float64 result.
+        """
+        Qs = 1
+        wind_speed = numpy.array([1, 2, 5, 10])
+        sigma_y = numpy.array([200, 50, 10, 1])
+        sigma_z = numpy.array([10, 20, 5, 1])
+        dy = numpy.array([50, 0, -5, 1])
+        Zr = 5
+        Hs = numpy.array([5, 10, 2, 3])
+        Hm = 500
+        molecular_mass = 16
+
+        c_expected = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, verbose = self.verbose)
+        c = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, dtype = numpy.float32, verbose = self.verbose)
+
+        self.assertEqual(c.dtype, numpy.float32)
+        self.assertTrue(numpy.allclose(c, c_expected, rtol = 1e-5))
+
+    def test_sigma_concentration(self):
+        """
+        sigma and concentration in one pass, in blocks, is the same as the two steps.
+        """
+        n = 10
+        dx = numpy.linspace(-10, 2000, n)
+        z0 = 0.5
+        tc = numpy.linspace(0, 1, n)
+        dispersion_constants = GPF.get_dispersion_constants("farm", verbose = self.verbose)
+        stability_index = numpy.arange(n) % 6
+        Qs = numpy.linspace(0.5, 2, n)
+        wind_speed = numpy.linspace(1, 10, n)
+        dy = numpy.linspace(-50, 50, n)
+        Zr = 5
+        Hs = 5
+        Hm = 500
+        molecular_mass = 16
+
+        sigma_y, sigma_z = GPF.calculate_sigma(dx, z0, tc, dispersion_constants, stability_index, tc_minimum = 0.1, offset_sigma_z = 1, verbose = self.verbose)
+        c_expected = GPF.calculate_concentration(Qs, wind_speed, sigma_y, sigma_z, dy, Zr, Hs, Hm, molecular_mass, verbose = self.verbose)
+        c = GPF.calculate_sigma_concentration(dx, z0, tc, dispersion_constants, stability_index, Qs, wind_speed, dy, Zr, Hs, Hm, molecular_mass, tc_minimum = 0.1, offset_sigma_z = 1, block_size = 3, verbose = self.verbose)
+
+        self.assertEqual(c.shape, (n,))
+        self.assertTrue(numpy.allclose(c, c_expected, equal_nan = True))
+
 
-        
 
 class Test_small_functions(unittest.TestCase):
 
@@ -62,6 +62,116 @@ class Test_init(unittest.TestCase):
         self.assertTrue(numpy.all(S.dx == dx))
         
 
+class Test_calculate_dxdy(unittest.TestCase):
+
+    def setUp(self):
+        self.verbose = 1
+
+    def test_same_as_functions(self):
+        """
+        Source and measurement are converted in one call, the result should be the same as converting them separately.
+        """
+        latS = 53.2835083
+        lonS = 6.30388
+        latM = numpy.array([53.2838, 53.2840, 53.2836])
+        lonM = numpy.array([6.3030, 6.3031, 6.3029])
+        latR = 53.28375
+        lonR = 6.3024917
+        wind_direction = numpy.array([0, 90, 225])
+
+        dlatS, dlonS = GPF.latlon2dlatdlon(latS, lonS, latR, lonR)
+        dlatM, dlonM = GPF.latlon2dlatdlon(latM, lonM, latR, lonR)
+        dx_expected, dy_expected = GPF.dlatdlon2dxdy(dlatS, dlonS, dlatM, dlonM, wind_direction)
+
+        S = GPSO.Source(0, "ch4", latS = latS, lonS = lonS, latM = latM, lonM = lonM, latR = latR, lonR = lonR, wind_direction = wind_direction, verbose = self.verbose)
+        S.calculate_dxdy()
+
+        self.assertTrue(numpy.allclose(S.dlatM, dlatM))
+        self.assertTrue(numpy.allclose(S.dlonM, dlonM))
+        self.assertTrue(numpy.allclose(S.dx, dx_expected))
+        self.assertTrue(numpy.allclose(S.dy, dy_expected))
+
+        # source and measurement both series
+        latS = latS + numpy.array([0, 0.001, -0.001])
+        dlatS, dlonS = GPF.latlon2dlatdlon(latS, lonS, latR, lonR)
+        dx_expected, dy_expected = GPF.dlatdlon2dxdy(dlatS, dlonS, dlatM, dlonM, wind_direction)
+
+        S = GPSO.Source(0, "ch4", latS = latS, lonS = numpy.full(3, lonS), latM = latM, lonM = lonM, latR = latR, lonR = lonR, wind_direction = wind_direction, verbose = self.verbose)
+        S.calculate_dxdy()
+
+        self.assertTrue(numpy.allclose(S.dlatS, dlatS))
+        self.assertTrue(numpy.allclose(S.dx, dx_expected))
+        self.assertTrue(numpy.allclose(S.dy, dy_expected))
+
+    def test_no_location(self):
+        S = GPSO.Source(0, "ch4", latS = 53.28, lonS = 6.30, wind_direction = 0, verbose = self.verbose)
+        with self.assertRaises(ValueError) as cm:
+            S.calculate_dxdy()
+        self.assertEqual(str(cm.exception), "GPSource.calculate_dxdy(): no location data for: dlatS, dlonS, latR, lonR")
+
+
+class Test_calculate_sigma_y_z(unittest.TestCase):
+
+    def setUp(self):
+        self.verbose = 1
+
+    def test_no_dispersion_mode(self):
+        S = GPSO.Source(0, "ch4", dx = numpy.arange(3), z0 = 0.3, wind_speed = 2, stability_index = 1, verbose = self.verbose)
+        with self.assertRaises(ValueError) as cm:
+            S.calculate_sigma_y_z()
+        self.assertEqual(str(cm.exception), "GPSource.Source.calculate_sigma_y_z(): variable dispersion_mode is missing")
+
+
+class Test_calculate_sigma_y_z_sources(unittest.TestCase):
+
+    def setUp(self):
+        self.verbose = 1
+
+    def test_same_as_per_source(self):
+        """
+        The result for several sources in one call is the same as for each source separately. 
+        """
+        dx = numpy.array([-10.0, 50, 100, 1e4])
+        kwargs = [
+            {"dx": dx, "z0": 0.3, "wind_speed": 2, "stability_index": numpy.array([0, 1, 3, 5]), "dispersion_mode": "farm", "offset_sigma_z": 0, "tc_minimum": 0},
+            {"dx": 2 * dx, "z0": 0.1, "tc": 100, "wind_speed": 5, "stability_index": 2, "dispersion_mode": "sea", "offset_sigma_z": 10, "tc_minimum": 300},
+        ]
+        
+        sources = [GPSO.Source(i, "ch4", **kw) for i, kw in enumerate(kwargs)]
+        GPSO.calculate_sigma_y_z_sources(sources, verbose = self.verbose)
+        
+        for i, kw in enumerate(kwargs):
+            with self.subTest(i):
+                S = GPSO.Source(i, "ch4", **kw)
+                S.calculate_sigma_y_z(verbose = self.verbose)
+                self.assertTrue(numpy.allclose(sources[i].sigma_y, S.sigma_y, equal_nan = True))
+                self.assertTrue(numpy.allclose(sources[i].sigma_z, S.sigma_z, equal_nan = True))
+
+
+class Test_calculate_concentration_sources(unittest.TestCase):
+
+    def setUp(self):
+        self.verbose = 1
+
+    def test_same_as_per_source(self):
+        """
+        The result for several sources in one call is the same as for each source separately, also with other molecules. 
+        """
+        kwargs = [
+            {"qs": 1, "wind_speed": numpy.array([1, 2, 5, 10]), "sigma_y": numpy.array([200, 50, 10, 1]), "sigma_z": numpy.array([10, 20, 5, 1]), "dy": numpy.array([50, 0, -5, 1]), "zr": 5, "hs": 5, "hm": 500},
+            {"qs": numpy.array([0.5, 1, 2, 3]), "wind_speed": 3, "sigma_y": 20, "sigma_z": 8, "dy": numpy.array([0, 10, 20, 30]), "zr": 2, "hs": 10, "hm": 300},
+        ]
+        molecules = ["ch4", "co2"]
+        
+        sources = [GPSO.Source(i, molecules[i], **kw) for i, kw in enumerate(kwargs)]
+        conc = GPSO.calculate_concentration_sources(sources, verbose = self.verbose)
+        
+        self.assertEqual(conc.shape, (2, 4))
+        for i, kw in enumerate(kwargs):
+            with self.subTest(i):
+                S = GPSO.Source(i, molecules[i], **kw)
+                self.assertTrue(numpy.allclose(conc[i], S.calculate_concentration(verbose = self.verbose)))
+
            
         
 if __name__ == '__main__': 
@@ -70,4 +180,16 @@ if __name__ == '__main__':
     if 1:
         suite = unittest.TestLoader().loadTestsFromTestCase( Test_init)
         unittest.TextTestRunner(verbosity=verbosity).run(suite)             
+
+    if 1:
+        suite = unittest.TestLoader().loadTestsFromTestCase( Test_calculate_dxdy)
+        unittest.TextTestRunner(verbosity=verbosity).run(suite)             
+
+    if 1:
+        suite = unittest.TestLoader().loadTestsFromTestCase( Test_calculate_sigma_y_z_sources)
+        unittest.TextTestRunner(verbosity=verbosity).run(suite)
+
+    if 1:
+        suite = unittest.TestLoader().loadTestsFromTestCase( Test_calculate_concentration_sources)
+        unittest.TextTestRunner(verbosity=verbosity).run(suite)             
         
\ No newline at end of file
@@ -185,19 +185,23 @@ class Test_parse_data(unittest.TestCase):
         self.assertEqual(S.sources[0].dx, 1)
         self.assertEqual(S.sources[0].dy, 2)
         
-    def test_source_dxdy_from_df_SX(self):
-        temp = {
-            "dxS0": numpy.arange(10),
-            "dyS0": numpy.arange(10)+10,
-        }
-        df = pandas.DataFrame(temp)
-        S = GP.GaussianPlume(sources = self.sources, verbose = self.verbose, df = df)
- 
-        source = self.sources[0]
-        source_index = 0
-        S.parse_dx_dy(source_index, source, verbose = self.verbose)
-        self.assertTrue(numpy.allclose(S.sources[0].dx, temp["dxS0"]))
-        self.assertTrue(numpy.allclose(S.sources[0].dy, temp["dyS0"]))
+    def test_source_dxdy_from_df(self):
+        # the columns for one source (dxS0) and for all sources (dxS)
+        for suffix in ["S0", "S"]:
+            with self.subTest(suffix):
+                temp = {
+                    "dx{:s}".format(suffix): numpy.arange(10),
+                    "dy{:s}".format(suffix): numpy.arange(10)+10,
+                }
+                df = pandas.DataFrame(temp)
+                sources = data()[1]
+                S = GP.GaussianPlume(sources = sources, verbose = self.verbose, df = df)
+         
+                source = sources[0]
+                source_index = 0
+                S.parse_dx_dy(source_index, source, verbose = self.verbose)
+                numpy.testing.assert_allclose(S.sources[0].dx, temp["dx{:s}".format(suffix)], rtol = 1e-5, atol = 1e-8)
+                numpy.testing.assert_allclose(S.sources[0].dy, temp["dy{:s}".format(suffix)], rtol = 1e-5, atol = 1e-8)
 
     def test_source_dxdy_from_source_df(self):
         temp = {
@@ -211,23 +215,8 @@ class Test_parse_data(unittest.TestCase):
         source = self.sources[0]
         source_index = 0
         S.parse_dx_dy(source_index, source, verbose = self.verbose)
-        self.assertTrue(numpy.isclose(S.sources[0].dx, 10))
-        self.assertTrue(numpy.isclose(S.sources[0].dy, 20))
-
-    def test_source_dxdy_from_df_S(self):
-        temp = {
-            "dxS": numpy.arange(10),
-            "dyS": numpy.arange(10)+10,
-        }
-        df = pandas.DataFrame(temp)
-        S = GP.GaussianPlume(sources = self.sources, verbose = self.verbose, df = df)
- 
-        source = self.sources[0]
-        source_index = 0
-        S.parse_dx_dy(source_index, source, verbose = self.verbose)
-        self.assertTrue(numpy.allclose(S.sources[0].dx, temp["dxS"]))
-        self.assertTrue(numpy.allclose(S.sources[0].dy, temp["dyS"]))
-        
+        numpy.testing.assert_allclose(S.sources[0].dx, 10, rtol = 1e-5, atol = 1e-8)
+        numpy.testing.assert_allclose(S.sources[0].dy, 20, rtol = 1e-5, atol = 1e-8)
 
     def test_source_dxdy_set_manually_preference_above_df_SX(self):
         temp = {
@@ -263,8 +252,8 @@ class Test_parse_data(unittest.TestCase):
         source = self.sources[0]
         source_index = 0
         S.parse_dx_dy(source_index, source, verbose = self.verbose)
-        self.assertTrue(numpy.allclose(S.sources[0].dx, df_temp["dxS0"]))
-        self.assertTrue(numpy.allclose(S.sources[0].dy, df_temp["dyS0"]))
+        numpy.testing.assert_allclose(S.sources[0].dx, df_temp["dxS0"], rtol = 1e-5, atol = 1e-8)
+        numpy.testing.assert_allclose(S.sources[0].dy, df_temp["dyS0"], rtol = 1e-5, atol = 1e-8)
     
 
     def test_source_dxdy_from_source_df_above_df_S(self):
@@ -284,8 +273,8 @@ class Test_parse_data(unittest.TestCase):
         source = self.sources[0]
         source_index = 0
         S.parse_dx_dy(source_index, source, verbose = self.verbose)
-        self.assertTrue(numpy.isclose(S.sources[0].dx, 100))
-        self.assertTrue(numpy.isclose(S.sources[0].dy, 200))
+        numpy.testing.assert_allclose(S.sources[0].dx, 100, rtol = 1e-5, atol = 1e-8)
+        numpy.testing.assert_allclose(S.sources[0].dy, 200, rtol = 1e-5, atol = 1e-8)
 
 
 
@@ -346,8 +335,8 @@ class Test_parse_data(unittest.TestCase):
         source = self.sources[0]
         source_index = 0
         S.parse_wind(source_index, source, verbose = self.verbose)
-        self.assertTrue(numpy.allclose(S.sources[0].wind_direction, temp["wind_direction"]))
-        self.assertTrue(numpy.allclose(S.sources[0].wind_speed, temp["wind_speed"]))
+        numpy.testing.assert_allclose(S.sources[0].wind_direction, temp["wind_direction"], rtol = 1e-5, atol = 1e-8)
+        numpy.testing.assert_allclose(S.sources[0].wind_speed, temp["wind_speed"], rtol = 1e-5, atol = 1e-8)
 
 
     def test_parse_source_parameter_qs_set_earlier(self):
@@ -401,7 +390,7 @@ class Test_parse_data(unittest.TestCase):
         
         S.sources[0].qs = S.parse_source_parameter(destination, label, parse_order, source_index, S.sources[0], verbose = self.verbose)
 
-        self.assertTrue(numpy.allclose(S.sources[0].qs, temp["qs S0"]))
+        numpy.testing.assert_allclose(S.sources[0].qs, temp["qs S0"], rtol = 1e-5, atol = 1e-8)
         self.assertTrue(S.log["qs S0"] == "from df SX, no nan")
                 
     def test_parse_source_parameter_qs_from_df(self):
@@ -420,7 +409,7 @@ class Test_parse_data(unittest.TestCase):
         
         S.sources[0].qs = S.parse_source_parameter(destination, label, parse_order, source_index, S.sources[0], verbose = self.verbose)
 
-        self.assertTrue(numpy.allclose(S.sources[0].qs, temp["qs"]))
+        numpy.testing.assert_allclose(S.sources[0].qs, temp["qs"], rtol = 1e-5, atol = 1e-8)
         self.assertTrue(S.log["qs S0"] == "from df, no nan")
         
         
@@ -464,7 +453,7 @@ class Test_parse_data(unittest.TestCase):
         S.channels[0].concentration_measured = S.parse_source_parameter(destination, label, parse_order, channel_index, S.channels[0], verbose = self.verbose)
         # print(S.channels[0].concentration_measured)
         # print(S.log["ppb C0"])
-        self.assertTrue(numpy.allclose(S.channels[0].concentration_measured, temp["ppb C0"]))
+        numpy.testing.assert_allclose(S.channels[0].concentration_measured, temp["ppb C0"], rtol = 1e-5, atol = 1e-8)
         self.assertTrue(S.log["ppb C0"] == "from df, no nan")     
 
 
@@ -6,6 +6,9 @@ Some timestamps are missing or double.
 """
 
 
+import concurrent.futures
+import io
+import os
 import pathlib
 
 import numpy
@@ -16,18 +19,52 @@ import pandas
 
 
 
-reload_measurement_to_pickle = False
+reload_measurement_to_parquet = False
 
-measurement_paf = pathlib.Path(r"C:\Measurements\CLINSH\Plumes_data_Campagne2.csv")
-measurement_pickle_paf = pathlib.Path(r"C:\Measurements\CLINSH\Plumes_data_Campagne2.pickle")
+# parse the measurement data with the multithreaded pyarrow csv reader (pyarrow has to be installed)
+# the GPS files have rows with a various number of columns, pyarrow can't read those, they are read with the default engine
+use_arrow = True
 
-if reload_measurement_to_pickle or measurement_pickle_paf.exists() == False:
-    with open(measurement_paf, "rb") as F:
-        mess_df = pandas.read_csv(F, header = 0, delimiter = ",", parse_dates = [0], index_col = 0) 
-    mess_df.to_pickle(measurement_pickle_paf)
+measurement_paf = pathlib.Path(r"C:\Measurements\CLINSH\Plumes_data_Campagne2.csv")
+measurement_parquet_paf = pathlib.Path(r"C:\Measurements\CLINSH\Plumes_data_Campagne2.parquet")
+
+
+def load_measurement_data(reload = False):
+    if reload or measurement_parquet_paf.exists() == False:
+        with open(measurement_paf, "rb") as F:
+            mess_df = pandas.read_csv(F, header = 0, delimiter = ",", parse_dates = [0], index_col = 0, engine = "pyarrow" if use_arrow else "c") 
+        mess_df.to_parquet(measurement_parquet_paf, compression = "zstd")
+    else:   
+        mess_df = pandas.read_parquet(measurement_parquet_paf)
+    return mess_df
+
+
+def init_worker():
+    # each worker process loads the measurement data once, it is not sent along with every day
+    global mess_df
+    mess_df = load_measurement_data()
+
+
+def to_seconds(mat, grid_rows, n_grid):
+    """
+    Put the rows of `mat` on a grid of seconds, row i goes to grid_rows[i]. 
+    
+    The same as resample("s").mean().ffill(limit = 1) in pandas, done on the ndarray. 
+    """
+    # mean: if there are two values in the same second, take the mean, missing values are skipped
+    finite_mat = numpy.isfinite(mat)
+    total = numpy.zeros((n_grid, mat.shape[1]))
+    count = numpy.zeros((n_grid, mat.shape[1]))
+    numpy.add.at(total, grid_rows, numpy.where(finite_mat, mat, 0))
+    numpy.add.at(count, grid_rows, finite_mat)
+    with numpy.errstate(invalid = "ignore"):
+        mean = total / count
+    # ffill: if a value is missing, forward fill it, with a limit of 1. 
+    # only values that were not missing themselves are copied to the next second
+    fill = numpy.isnan(mean[1:]) & ~numpy.isnan(mean[:-1])
+    mean[1:][fill] = mean[:-1][fill]
+    return mean
 
-else:   
-    mess_df = pandas.read_pickle(measurement_pickle_paf)
 
 path = pathlib.Path(r"C:\Measurements\CLINSH")
 
@@ -60,89 +97,126 @@ gps_filenames = [
     pathlib.Path(r"C:\Measurements\CLINSH\AIS\ECNDATA_20191217.csv"),
 ]
 
-all_ship_ids = numpy.array([], dtype = int)
 
-for paf in gps_filenames:
+def process_day(paf):
+    """
+    Import the GPS data of one day, merge it with the measurement data and save the result. The days are independent of each other. 
+    """
 
     print(paf)
 
+    # read the file from disk once, it is parsed twice from memory
+    # the header line can't be used for the number of ships, its length is not always correct
+    with open(paf, "rb") as F:
+        data = F.read()
+
     # first, construct the header. 
     # import the column with nr ships, look for the maximum, and make the header (column names)
     # paf = pathlib.Path(r"C:\Measurements\CLINSH\AIS\ECNDATA_20191119.csv")
-    with open(paf, "rb") as F:
-        df = pandas.read_csv(F, header = 1, delimiter = ",", usecols = ["nrships"]) 
+    df = pandas.read_csv(io.BytesIO(data), header = 1, delimiter = ",", usecols = ["nrships"]) 
 
     max_ships = int(max(df["nrships"]) )
     print(max_ships)
+    # the column names of the slots are made once, and used for the header and to select the columns
+    id_cols = ["id.{:d}".format(i) for i in range(max_ships)]
+    lat_cols = ["lat.{:d}".format(i) for i in range(max_ships)]
+    lon_cols = ["lon.{:d}".format(i) for i in range(max_ships)]
     names = ["datetime","sampling","nrships"]
     for i in range(max_ships):
-        names.append("id.{:d}".format(i))
-        names.append("lat.{:d}".format(i))
-        names.append("lon.{:d}".format(i))
+        names.append(id_cols[i])
+        names.append(lat_cols[i])
+        names.append(lon_cols[i])
         names.append("speed.{:d}".format(i))
         names.append("heading.{:d}".format(i))
         names.append("imo.{:d}".format(i))
         
     # now import the data
     df = 0
-    with open(paf, "rb") as F:
-        df = pandas.read_csv(F, delimiter = ",", parse_dates = [0], index_col = 0, names = names, header = None, skiprows = 2) 
+    # the ship ids are integers, read them as nullable Int64 instead of float64 with NaN
+    # read_csv wraps ids that do not fit into Int32 without an error, so they are narrowed after a check
+    df = pandas.read_csv(io.BytesIO(data), delimiter = ",", parse_dates = [0], index_col = 0, names = names, header = None, skiprows = 2, dtype = dict.fromkeys(id_cols, "Int64")) 
+    del data
+
+    # the id, lat and lon of all slots as matrices, shape (len(df), max_ships)
+    # a missing id is -1
+    ids = df[id_cols].to_numpy(dtype = numpy.int64, na_value = -1)
+    if ids.size > 0 and (ids.min() < -1 or ids.max() >= 2**31):
+        raise ValueError("{:s}: ship ids outside the range 0 ... 2**31 - 1.".format(str(paf)))
+    ids = ids.astype(numpy.int32)
+    lats = df[lat_cols].to_numpy()
+    lons = df[lon_cols].to_numpy()
+    present = ids != -1
 
     # extract which ships are present
-    ship_ids = numpy.array([], dtype = int)
-    for i in range(max_ships):
-        x = df["id.{:d}".format(i)].to_numpy()
-        idx = numpy.where(numpy.isfinite(x))[0]
-        temp = numpy.unique(x[idx])
-        ship_ids = numpy.concatenate((ship_ids, temp), axis = None)
     # list with unique ships
-    ship_ids = numpy.array(numpy.unique(ship_ids), dtype = int)
-    all_ship_ids = numpy.concatenate((all_ship_ids, ship_ids), axis = None)
+    ship_ids = numpy.array(numpy.unique(ids[present]), dtype = int)
     nr_unique_ships = len(ship_ids)
 
-    # make a table with the lat/lon
-    latlon = numpy.zeros((len(df), nr_unique_ships * 2))
-    latlon[:,:] = numpy.nan
-    col_names_lat = []
-    col_names_lon = []
-    for ship_i, ship_id in enumerate(ship_ids):
-        col_names_lat.append("latS{:d}".format(ship_id))
-        col_names_lon.append("lonS{:d}".format(ship_id))
-        for i in range(max_ships):
-            ids = df["id.{:d}".format(i)].to_numpy()
-            if ship_id in ids:
-                idx = numpy.where(ids == ship_id)[0]
-                lat = df["lat.{:d}".format(i)].to_numpy()
-                lon = df["lon.{:d}".format(i)].to_numpy()
-                latlon[idx, ship_i] =lat[idx]
-                latlon[idx, ship_i + nr_unique_ships] = lon[idx]
+    # make a table with the lat and one with the lon, one column per ship
+    # the column of each ship is found with a search in the sorted ship_ids, for all rows and slots at once
+    lat_mat = numpy.full((len(df), nr_unique_ships), numpy.nan)
+    lon_mat = numpy.full((len(df), nr_unique_ships), numpy.nan)
+    col_names_lat = ["latS{:d}".format(ship_id) for ship_id in ship_ids]
+    col_names_lon = ["lonS{:d}".format(ship_id) for ship_id in ship_ids]
+    rows, slots = numpy.nonzero(present)
+    ship_cols = numpy.searchsorted(ship_ids, ids[rows, slots])
+    lat_mat[rows, ship_cols] = lats[rows, slots]
+    lon_mat[rows, ship_cols] = lons[rows, slots]
+
+    # put the rows on a regular grid of whole seconds
+    seconds = df.index.floor("s")
+    grid = pandas.date_range(seconds.min(), seconds.max(), freq = "s")
+    grid_rows = ((seconds - grid[0]) // pandas.Timedelta(seconds = 1)).to_numpy()
+
+    lat_mat = to_seconds(lat_mat, grid_rows, len(grid))
+    lon_mat = to_seconds(lon_mat, grid_rows, len(grid))
+
+    # only the seconds with measurement data are left after the merge
+    # a ship without any position in those seconds would be a column with NaN only, it is left out now, this is known from the matrices
+    in_mess = grid.isin(mess_df.index)
+    keep_lat = numpy.isfinite(lat_mat[in_mess]).any(axis = 0)
+    keep_lon = numpy.isfinite(lon_mat[in_mess]).any(axis = 0)
 
     # make a dataframe with the ship positions
     # each set of columns (lat/lon) represents 1 ship
-    col_names = col_names_lat + col_names_lon
-    gps_df = pandas.DataFrame(latlon, index = df.index, columns = col_names)
-
-    # mean: if there are two values, take the mean
-    # pad: if a value is missing, forward fill it, with a limit. 
-    gps_df = gps_df.resample("S").mean().pad(limit = 1)
+    col_names = [cn for cn, keep in zip(col_names_lat, keep_lat) if keep] + [cn for cn, keep in zip(col_names_lon, keep_lon) if keep]
+    gps_df = pandas.DataFrame(numpy.hstack([lat_mat[:, keep_lat], lon_mat[:, keep_lon]]), index = grid, columns = col_names)
 
     # inner merge with measurement data
     # this means that only timestamps with a plume are left
-    result = pandas.merge(mess_df, gps_df, left_index=True, right_index=True, how="inner")
-
-    # drop columns with NaN only
-    result.dropna(axis = "columns", how = "all", inplace = True)
+    # both are sorted by time and gps_df has each second once, so the common seconds are selected from both and put side by side
+    # a double timestamp in the measurement data can't be aligned that way, then the real merge is used
+    if mess_df.index.is_unique:
+        common = mess_df.index.intersection(gps_df.index)
+        result = pandas.concat([mess_df.loc[common], gps_df.loc[common]], axis = 1)
+    else:
+        result = pandas.merge(mess_df, gps_df, left_index=True, right_index=True, how="inner")
+
+    # drop columns with NaN only, only the columns of the measurement data have to be checked
+    empty = result[mess_df.columns].isna().all().to_numpy()
+    result.drop(columns = mess_df.columns[empty], inplace = True)
 
     date = paf.stem[8:]
 
     ships_paf = path.joinpath("{:s}_ships.csv".format(date))
     numpy.savetxt(ships_paf, ship_ids, fmt = "%d")
 
-    pickle_paf = path.joinpath("{:s}_merged_data.pickle".format(date))
-    result.to_pickle(pickle_paf)
+    # all days go in one parquet dataset, partitioned by date: merged/date=20191119/...
+    # rewriting a day replaces its partition, the workers each write their own partition
+    # the ship columns differ per day, read a day from its partition to get all of its columns: pandas.read_parquet(path.joinpath("merged", "date=20191119"))
+    result.rename_axis("datetime").reset_index().assign(date = date).to_parquet(path.joinpath("merged"), partition_cols = ["date"], compression = "zstd", existing_data_behavior = "delete_matching")
+
+    return ship_ids
+
+
+if __name__ == "__main__":
+    # make the parquet file, if needed, before the workers start
+    load_measurement_data(reload = reload_measurement_to_parquet)
 
+    with concurrent.futures.ProcessPoolExecutor(max_workers = os.cpu_count(), initializer = init_worker) as executor:
+        day_ship_ids = list(executor.map(process_day, gps_filenames))
 
-all_ship_ids = numpy.array(numpy.unique(all_ship_ids), dtype = int)
+    all_ship_ids = numpy.array(numpy.unique(numpy.concatenate(day_ship_ids) if day_ship_ids else numpy.array([], dtype = int)), dtype = int)
 
-ships_paf = path.joinpath("all_ships.csv")
-numpy.savetxt(ships_paf, all_ship_ids, fmt = "%d")
+    ships_paf = path.joinpath("all_ships.csv")
+    numpy.savetxt(ships_paf, all_ship_ids, fmt = "%d")
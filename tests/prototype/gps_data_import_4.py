@@ -121,7 +121,8 @@ gps_filenames = [
     # gps_path.joinpath(r"ECNDATA_20191217.csv"),
 ]
 
-all_ship_ids = numpy.array([], dtype = int)
+# the ship ids of each day, made unique once after the loop
+day_ship_ids = []
 
 for paf in gps_filenames:
 
@@ -150,17 +151,16 @@ for paf in gps_filenames:
         df = pandas.read_csv(F, delimiter = ",", parse_dates = [0], index_col = 0, names = names, header = None, skiprows = 2) 
 
     # extract which ships are present
-    ship_ids = numpy.array([], dtype = int)
-    for i in range(max_ships):
-        x = df["id.{:d}".format(i)].to_numpy()
-        idx = numpy.where(numpy.isfinite(x))[0]
-        temp = numpy.unique(x[idx])
-        ship_ids = numpy.concatenate((ship_ids, temp), axis = None)
-    # list with unique ships
-    ship_ids = numpy.array(numpy.unique(ship_ids), dtype = int)
+    # list with unique ships, one unique over the ids of all slots
+    ids = df[["id.{:d}".format(i) for i in range(max_ships)]].to_numpy()
+    ship_ids = numpy.array(numpy.unique(ids[numpy.isfinite(ids)]), dtype = int)
     # all_ship_ids = numpy.concatenate((all_ship_ids, ship_ids), axis = None)
     nr_unique_ships = len(ship_ids)
 
+    # the lat and lon of each slot as arrays, taken from df once and not for every ship, the ids are the columns of ids
+    lat_arrs = [df["lat.{:d}".format(i)].to_numpy() for i in range(max_ships)]
+    lon_arrs = [df["lon.{:d}".format(i)].to_numpy() for i in range(max_ships)]
+
     # make a table with the lat/lon
     latlon = numpy.zeros((len(df), nr_unique_ships * 2))
     latlon[:,:] = numpy.nan
@@ -170,13 +170,11 @@ for paf in gps_filenames:
         col_names_lat.append("latS{:d}".format(ship_id))
         col_names_lon.append("lonS{:d}".format(ship_id))
         for i in range(max_ships):
-            ids = df["id.{:d}".format(i)].to_numpy()
-            if ship_id in ids:
-                idx = numpy.where(ids == ship_id)[0]
-                lat = df["lat.{:d}".format(i)].to_numpy()
-                lon = df["lon.{:d}".format(i)].to_numpy()
-                latlon[idx, ship_i] =lat[idx]
-                latlon[idx, ship_i + nr_unique_ships] = lon[idx]
+            # one pass over the ids, skip the slot if the ship is not in it
+            idx = numpy.flatnonzero(ids[:, i] == ship_id)
+            if idx.size:
+                latlon[idx, ship_i] = lat_arrs[i][idx]
+                latlon[idx, ship_i + nr_unique_ships] = lon_arrs[i][idx]
 
     # make a dataframe with the ship positions
     # each set of columns (lat/lon) represents 1 ship
@@ -201,7 +199,7 @@ for paf in gps_filenames:
             ship_ids.append(cn[4:])
     
     ship_ids = numpy.array(ship_ids, dtype = int)
-    all_ship_ids = numpy.concatenate((all_ship_ids, ship_ids), axis = None)
+    day_ship_ids.append(ship_ids)
 
     date = paf.stem[8:]
 
@@ -212,7 +210,7 @@ for paf in gps_filenames:
     result.to_pickle(pickle_paf)
 
 
-all_ship_ids = numpy.array(numpy.unique(all_ship_ids), dtype = int)
+all_ship_ids = numpy.array(numpy.unique(numpy.concatenate(day_ship_ids) if day_ship_ids else numpy.array([], dtype = int)), dtype = int)
 
 ships_paf = output_path.joinpath("all_ships.csv")
 numpy.savetxt(ships_paf, all_ship_ids, fmt = "%d")